@@ -0,0 +1,55 @@
+import argparse
+import logging
+import os.path
+from concurrent.futures import ProcessPoolExecutor
+from helpers.reader import Reader, RACE_TYPES
+from helpers.renderer import Renderer
+from helpers.command import add_sheets_arguments, setup_sheets
+from helpers.timing import tracer
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    handlers=[logging.StreamHandler()]
+)
+_logger = logging.getLogger(__name__)
+
+
+class BatchCommand(argparse.ArgumentParser):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.add_argument("sheet", help="Name of the race sheet to use (e.g. 'Race 7')")
+        self.add_argument("-t", "--types", help=f"Types of visuals to render (default: {' '.join(RACE_TYPES)})", dest='types', nargs='+', choices=RACE_TYPES, default=list(RACE_TYPES))
+        self.add_argument("-o", "--output-dir", help="Directory where visuals are rendered (as TYPE.png)", dest='output_dir', default='./output')
+        self.add_argument("-i", "--input", help="Input file to use (use 'gsheet:TIMESHEET_ID' for google sheet (replace TIMESHEET_ID with the id of the sheet of course)", dest='input', default='gsheet')
+        self.add_argument("-j", "--jobs", help="Number of visuals rendered in parallel", dest='jobs', type=int, default=1)
+        add_sheets_arguments(self)
+        self.add_argument("-T", "--trace", help="Write the timings of the run in this file (Chrome trace format), renders made by other processes (-j) are not included", dest='trace', default=None)
+
+
+def render_all(configs: dict, jobs: int = 1, use_cache: bool = True) -> list:
+    """
+    Render every config of `configs`, in `jobs` processes when greater than 1
+    """
+    configs = list(configs.values())
+    if jobs > 1:
+        with ProcessPoolExecutor(jobs) as executor:
+            return list(executor.map(Renderer.render, configs, [None] * len(configs), [use_cache] * len(configs)))
+    return [Renderer.render(config, use_cache=use_cache) for config in configs]
+
+####### MAIN
+
+if __name__ == "__main__":
+    args = BatchCommand().parse_args()
+    tracer.recording = bool(args.trace)
+    setup_sheets(args)
+
+    configs = Reader(args.types[0], args.input, args.sheet).read_all(args.types)
+    os.makedirs(args.output_dir, exist_ok=True)
+    for type, config in configs.items():
+        config.output = os.path.join(args.output_dir, f'{type}.png')
+
+    for output_filepath in render_all(configs, args.jobs, not args.no_cache):
+        _logger.info(f'Image successfully rendered in file "{os.path.realpath(output_filepath)}"')
+    if args.trace:
+        tracer.save(args.trace)
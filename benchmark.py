@@ -0,0 +1,211 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+BREAKING = 'breaking'
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.15
+# differences under these are noise, whatever their ratio
+MIN_DELTAS = {'cold_ms': 20, 'warm_ms': 10, 'peak_rss_mb': 10, 'py_alloc_peak_kb': 512}
+
+
+class BenchmarkCommand(argparse.ArgumentParser):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        subparsers = self.add_subparsers(dest='command', required=True, parser_class=argparse.ArgumentParser)
+        run = subparsers.add_parser('run', help="Benchmark every generator and the breaking renderer")
+        run.add_argument("types", help="Visual types to benchmark (default: all)", nargs='*')
+        run.add_argument("-r", "--repeat", help="Number of warm renders per visual", dest='repeat', type=int, default=DEFAULT_REPEAT)
+        run.add_argument("-o", "--output", help="JSON file where results are saved", dest='output', default=None)
+        compare = subparsers.add_parser('compare', help="Compare two saved runs and flag regressions")
+        compare.add_argument("baseline", help="JSON results of the reference run")
+        compare.add_argument("current", help="JSON results of the run to check")
+        compare.add_argument("-t", "--threshold", help=f"Relative slowdown flagged as a regression (default: {DEFAULT_THRESHOLD})", dest='threshold', type=float, default=DEFAULT_THRESHOLD)
+        worker = subparsers.add_parser('worker', help="(internal) benchmark one visual in this process")
+        worker.add_argument("type")
+        worker.add_argument("-r", "--repeat", dest='repeat', type=int, default=DEFAULT_REPEAT)
+
+
+def _pick_circuit():
+    """
+    First circuit with every asset a race visual needs, or the first one with
+    a map and a flag (visuals using its photo are then reported as skipped)
+    """
+    from data import circuits
+    def has(kind, circuit):
+        return os.path.exists(f'assets/circuits/{kind}/{circuit.id}.png')
+    complete = [c for c in circuits.values() if has('maps', c) and has('flags', c) and has('photos', c)]
+    return (complete or [c for c in circuits.values() if has('maps', c) and has('flags', c)])[0]
+
+
+def build_configs() -> dict:
+    """
+    Synthetic configs of every visual type, built from the defaults of data.py
+    """
+    import pandas
+    from data import pilots, teams, circuits
+    from helpers.calendar_reader import CalendarGeneratorConfig
+    from helpers.generator_config import FastestLap, GeneratorConfig
+    from models import Race
+
+    pilots_by_name = {pilot.name: pilot for pilot in pilots.values()}
+    names = list(pilots_by_name)[:20]
+    race = Race(round='7', laps=44, day=12, month='Mar', hour='21.00', circuit=_pick_circuit(),
+                pilots=pilots_by_name, teams=teams, type='Normale', swappings={})
+    splits = pandas.DataFrame([
+        [name, '43:12.123' if i == 0 else f'+{i * 1.234:.3f}', 'SMH', f'1:4{i % 10}.{100 + i}']
+        for i, name in enumerate(names)
+    ], columns=['I', 'J', 'K', 'L'])
+    team_names = [team.name for team in teams]
+
+    def config(type, **kwargs):
+        values = dict(type=type, output=f'{type}.png', pilots=pilots_by_name, teams=teams, race=race)
+        values.update(kwargs)
+        return GeneratorConfig(**values)
+
+    return {
+        'lineup': config('lineup'),
+        'presentation': config('presentation', description='Une course de 44 tours sur un tracé rapide ' * 6),
+        'results': config('results', ranking=splits['I'], fastest_lap=FastestLap(pilots_by_name[names[3]])),
+        'details': config('details', ranking=splits, fastest_lap=FastestLap(pilots_by_name[names[3]], '12', '1:41.103')),
+        'fastest': config('fastest', ranking=splits),
+        'pole': config('pole', qualif_ranking=[pilots_by_name[name] for name in names[:3]]),
+        'teams_ranking': config('teams_ranking', race=None, ranking_title='SEASON 5 TEAMS STANDINGS', ranking_subtitle='AFTER RACE 7',
+                                ranking=pandas.DataFrame([[name, str(300 - i * 20)] for i, name in enumerate(team_names)], columns=['Ecurie', 'Total'])),
+        'pilots_ranking': config('pilots_ranking', race=None, ranking_title='SEASON 5 PILOTS STANDINGS', ranking_subtitle='AFTER RACE 7',
+                                 ranking=pandas.DataFrame([[name, str(200 - i * 7), '5,5'] for i, name in enumerate(names)], columns=['Pilot', 'Total', 'Points par course'])),
+        'numbers': config('numbers', race=None),
+        'season_lineup': config('season_lineup', race=None),
+        'calendar': CalendarGeneratorConfig(type='calendar', season=5, output='calendar.png', races=[
+            {'index': str(i + 1), 'circuit': circuit, 'type': ['Normale', 'Sprint (2)', 'Double Grid (1)', '100 %'][i % 4],
+             'date': datetime.date(2023, 1 + i % 12, 1 + i), 'hour': '21:00'}
+            for i, circuit in enumerate(list(circuits.values())[:20])
+        ]),
+    }
+
+
+def _render(type: str, configs: dict):
+    if type == BREAKING:
+        from breaking import Renderer as BreakingRenderer
+        BreakingRenderer('Un pilote change d\'écurie', 'Il rejoint une nouvelle équipe pour la saison', None,
+                         '255,255,255', '0,0,0', output=None, input='assets/bg.png').render('PNG')
+    else:
+        from helpers.renderer import Renderer
+        Renderer.render(configs[type], 'PNG', use_cache=False)
+
+
+def run_worker(type: str, repeat: int) -> dict:
+    """
+    Benchmark `type` in this (fresh) process: the first render is cold (imports,
+    fonts and decoded assets included), the next `repeat` ones are warm
+    """
+    import logging
+    logging.disable(logging.INFO)
+    configs = build_configs()
+
+    start = time.perf_counter()
+    _render(type, configs)
+    cold = time.perf_counter() - start
+
+    warm = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _render(type, configs)
+        warm.append(time.perf_counter() - start)
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    _render(type, configs)
+    _, py_alloc_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'cold_ms': round(cold * 1000, 1),
+        'warm_ms': round(statistics.median(warm) * 1000, 1),
+        'warm_min_ms': round(min(warm) * 1000, 1),
+        'peak_rss_mb': round(peak_rss, 1),
+        'py_alloc_peak_kb': round(py_alloc_peak / 1024),
+        'py_blocks_retained': sys.getallocatedblocks() - blocks,
+    }
+
+
+def run(types: list, repeat: int) -> dict:
+    from helpers.renderer import Renderer
+    types = types or list(Renderer.generators) + [BREAKING]
+    results = {}
+    for type in types:
+        res = subprocess.run([sys.executable, __file__, 'worker', type, '-r', str(repeat)], capture_output=True, text=True)
+        if res.returncode:
+            error = res.stderr.strip().splitlines()[-1]
+            results[type] = {'skipped': error}
+            print(f'{type:15} skipped: {error}')
+            continue
+        results[type] = json.loads(res.stdout.strip().splitlines()[-1])
+        print(f'{type:15} ' + '  '.join(f'{key} {value}' for key, value in results[type].items()))
+    return {
+        'meta': {
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    """
+    Regressions of `current` against `baseline`, as (type, metric, before, after)
+    """
+    regressions = []
+    for type, after in current['results'].items():
+        before = baseline['results'].get(type)
+        if not before or 'skipped' in before or 'skipped' in after:
+            continue
+        for metric, min_delta in MIN_DELTAS.items():
+            if metric not in before or metric not in after:
+                continue
+            delta = after[metric] - before[metric]
+            ratio = after[metric] / before[metric] if before[metric] else 1
+            flag = delta > min_delta and ratio > 1 + threshold
+            print(f'{type:15} {metric:17} {before[metric]:>9} -> {after[metric]:>9} ({ratio - 1:+.0%}){"  REGRESSION" if flag else ""}')
+            if flag:
+                regressions.append((type, metric, before[metric], after[metric]))
+    return regressions
+
+
+def _git_commit() -> str:
+    res = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True)
+    return res.stdout.strip() or None
+
+####### MAIN
+
+if __name__ == "__main__":
+    args = BenchmarkCommand().parse_args()
+    if args.command == 'worker':
+        print(json.dumps(run_worker(args.type, args.repeat)))
+    elif args.command == 'run':
+        results = run(args.types, args.repeat)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(results, f, indent=1)
+    else:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        regressions = compare(baseline, current, args.threshold)
+        if regressions:
+            print(f'{len(regressions)} regression(s)')
+            exit(1)
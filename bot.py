@@ -1,15 +1,16 @@
+import asyncio
 import logging
 import disnake
 from disnake.ext import commands
 from datetime import datetime
+from io import BytesIO
 
-from helpers.reader import Reader
-from helpers.general_ranking_reader import GeneralRankingReader
-from helpers.renderer import Renderer
-
-from breaking import Renderer as BreakingRenderer
+from helpers.sheet_cache import snapshots
+from helpers.render_cache import renders
+from helpers.render_executor import RenderExecutor, render_breaking, render_race, render_ranking, DEFAULT_TIMEOUT, DEFAULT_WORKERS
 
 from data import teams_idx
+import config
 from config import discord_bot_token
 
 
@@ -27,6 +28,13 @@ command_sync_flags = commands.CommandSyncFlags.default()
 command_sync_flags.sync_commands_debug = True
 
 bot = commands.InteractionBot(command_sync_flags=command_sync_flags)
+snapshots.ttl = getattr(config, 'sheet_cache_ttl', snapshots.ttl)
+snapshots.check_revision = getattr(config, 'sheet_cache_check_revision', snapshots.check_revision)
+renders.max_bytes = getattr(config, 'render_cache_max_bytes', renders.max_bytes)
+render_executor = RenderExecutor(
+    max_workers=getattr(config, 'render_workers', DEFAULT_WORKERS),
+    timeout=getattr(config, 'render_timeout', DEFAULT_TIMEOUT)
+)
 
 FBRT_GUILD_ID = 923505034778509342
 FBRT_BOT_CHAN_ID = 1074632856443289610
@@ -34,6 +42,7 @@ FBRT_BOT_CHAN_ID = 1074632856443289610
 
 @bot.event
 async def on_ready():
+    await render_executor.warm()
     msg = f'Mesdames messieurs {"bonjour" if 5 < datetime.now().hour < 17 else "bonsoir"} !'
     await bot.get_guild(FBRT_GUILD_ID).get_channel(FBRT_BOT_CHAN_ID).send(msg)
     _logger.info('Connected !')
@@ -72,16 +81,12 @@ async def rankings(inter,
     _logger.info(f'{inter.user.display_name} called Rankings(what={what}, metric={metric})')
     await inter.response.defer()
 
-    _logger.info('Reading google sheet')
+    _logger.info('Reading google sheet and rendering image...')
     tech_metric = 'Total' if metric == 'Points' else metric
-    config = GeneralRankingReader(f'{what}_ranking', 'gsheet', 'tmp.png', 5, tech_metric).read()
-    _logger.info('Rendering image...')
-    output_filepath = Renderer.render(config)
+    content = await render_executor.submit(render_ranking, what, tech_metric)
     _logger.info('Sending image...')
-    with open(output_filepath, 'rb') as f:
-        picture = disnake.File(f)
-        await inter.followup.send(file=picture)
-        _logger.info('Image sent !')
+    await inter.followup.send(file=disnake.File(BytesIO(content), filename=f'{what}_ranking.png'))
+    _logger.info('Image sent !')
 
 
 @bot.slash_command(name="race", description='Race information')
@@ -94,17 +99,12 @@ async def race(inter: disnake.ApplicationCommandInteraction,
     sheet_name = f'Race {race_number}'
     await inter.response.defer()
 
-    _logger.info('Reading google sheet')
-    config = Reader(what, 'gsheet', sheet_name, 'tmp.png').read()
-
-    _logger.info('Rendering image...')
-    output_filepath = Renderer.render(config)
+    _logger.info('Reading google sheet and rendering image...')
+    content = await render_executor.submit(render_race, what, sheet_name)
 
     _logger.info('Sending image...')
-    with open(output_filepath, 'rb') as f:
-        picture = disnake.File(f)
-        await inter.followup.send(file=picture)
-        _logger.info('Image sent !')
+    await inter.followup.send(file=disnake.File(BytesIO(content), filename=f'{what}.png'))
+    _logger.info('Image sent !')
 
 
 @bot.slash_command(name="breaking", description='Breaking !')
@@ -127,16 +127,13 @@ async def breaking(inter,
     await inter.response.defer()
 
     _logger.info('Rendering image...')
-    input = (await img.to_file()).fp
-    renderer = BreakingRenderer(main_txt, secondary_txt, team, background, foreground,
-                                output='tmp.png', input=input, padding_top=padding_top)
-    output_filepath = renderer.render()
+    input = await img.read()
+    content = await render_executor.submit(render_breaking, main_txt, secondary_txt, team, background,
+                                           foreground, input, padding_top)
 
     _logger.info('Sending image...')
-    with open(output_filepath, 'rb') as f:
-        picture = disnake.File(f)
-        await inter.followup.send(file=picture)
-        _logger.info('Image sent !')
+    await inter.followup.send(file=disnake.File(BytesIO(content), filename='breaking.png'))
+    _logger.info('Image sent !')
 
 original_error_handler = bot.on_slash_command_error
 
@@ -144,7 +141,9 @@ original_error_handler = bot.on_slash_command_error
 async def on_slash_command_error(inter: disnake.ApplicationCommandInteraction, exception):
     what = inter.filled_options.get('what')
     await inter.delete_original_message()
-    if what in ('results', 'details', 'fastest'):
+    if isinstance(getattr(exception, 'original', exception), asyncio.TimeoutError):
+        await inter.channel.send("La génération a pris trop de temps, réessayez dans quelques instants.")
+    elif what in ('results', 'details', 'fastest'):
         await inter.channel.send("Une erreur est survenue dans la génération, êtes-vous sûr que la Google Sheet est bien remplie ? Si oui, contactez Xion.")
     else:
         await inter.channel.send('Une erreur est survenue dans la génération, contactez Xion.')
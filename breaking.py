@@ -4,6 +4,8 @@ import math
 from data import teams_idx
 from font_factory import FontFactory
 from models import Visual
+from helpers.assets import assets
+from helpers.timing import span
 from helpers.transform import *
 from PIL import Image, ImageDraw
 
@@ -29,6 +31,12 @@ class BreakingCommand(argparse.ArgumentParser):
         self.add_argument('-p', '--padding-top', help="Top padding in pixel to use to align the image", dest='padding_top', default=None)
 
 class Renderer:
+    preloaded_fonts = {'black': (84, 131)}
+
+    @classmethod
+    def preload(cls):
+        FontFactory.preload(cls.preloaded_fonts)
+
     def __init__(self, main:str, second:str, team_name:str, bg:tuple, fg:tuple, output:str, input:str, padding_top:int=None):
         self.bg_color = tuple(int(a) for a in bg.split(','))
         self.fg_color = tuple(int(a) for a in fg.split(','))
@@ -43,13 +51,21 @@ class Renderer:
         self.padding_top = int(padding_top) if isinstance(padding_top, (int, str)) else False
         _logger.info(f'padding_top will be {self.padding_top}')
 
-    def render(self):
-        with Image.open('assets/breaking/bg.png') as bg:
-            final = bg.copy().convert('RGB')
+    def render(self, image_format:str=None):
+        with span('render', type='breaking'):
+            with span('content'):
+                final = self.render_image()
+            with span('encode'):
+                if image_format:
+                    return to_buffer(final, image_format, quality=95)
+                final.save(self.output or 'breaking.png', quality=95)
+            return self.output
+
+    def render_image(self):
+        bg = assets.get('assets/breaking/bg.png')
 
         line_color = self.team.breaking_line_color if self.team else (159, 159, 159)
-        final = Image.new('RGB', (final.width, final.height), self.bg_color)
-        draw_lines_all(final, line_color, space_between_lines=4, line_width=2)
+        final = hatched_image((bg.width, bg.height), self.bg_color, line_color, space_between_lines=4, line_width=2)
         top_breaking_height = 155
         bottom_message_height = 215
         space_top_middle = 30
@@ -64,9 +80,7 @@ class Renderer:
 
         bottom_img = self._get_bottom_message_img(bg.width, bottom_message_height)
         paste(bottom_img, final, left=0, top=middle_dim.bottom+space_bottom_middle)
-
-        final.save(self.output or 'breaking.png', quality=95)
-        return self.output
+        return final
 
     def _get_top_breaking_img(self, width:int, height:int):
         img = Image.new('RGBA', (width, height), (255, 255, 255, 0))
@@ -116,8 +130,8 @@ class Renderer:
         draw.polygon(lower_triangle, (0,0,0,0))
 
         if self.team:
-            with Image.open(self.team.get_breaking_logo()) as team_img:
-                paste(resize(team_img, 175, 175), img, width-team_img.width-30, height-team_img.height)
+            team_img = assets.resized(self.team.get_breaking_logo(), 175, 175)
+            paste(team_img, img, width-team_img.width-30, height-team_img.height)
         return img
 
     def _get_bottom_message_img(self, width:int, height:int):
@@ -1,4 +1,7 @@
+import logging
 from PIL import ImageFont
+from helpers.cache import LRUCache
+from helpers.timing import timed
 FONT_PATH = 'assets/fonts/'
 
 POLEBG_FONT_NAME = 'Sorren Ex Black.otf'
@@ -7,27 +10,70 @@ BOLD_FONT_NAME = 'Formula1-Bold_web_0.ttf'
 WIDE_FONT_NAME = 'Formula1-Wide_web_0.ttf'
 BLACK_FONT_NAME = 'Formula1-Black.ttf'
 
+_logger = logging.getLogger(__name__)
+
+
+class FontRegistry:
+    """
+    Process-wide cache of parsed fonts keyed by (face, size, kwargs), so each
+    font file is only read from disk once per size instead of once per call.
+    """
+    def __init__(self, maxsize: int = 256):
+        self._fonts = LRUCache(maxsize)
+
+    def get(self, font_name: str, size: int, **kwargs) -> ImageFont.FreeTypeFont:
+        key = (font_name, size, tuple(sorted(kwargs.items())))
+        return self._fonts.get_or_create(key, lambda: self._load(font_name, size, **kwargs))
+
+    def preload(self, font_name: str, sizes):
+        for size in sizes:
+            self.get(font_name, size)
+
+    def clear(self):
+        self._fonts.clear()
+
+    def stats(self) -> dict:
+        return self._fonts.stats()
+
+    @timed('fonts.load')
+    def _load(self, font_name: str, size: int, **kwargs) -> ImageFont.FreeTypeFont:
+        _logger.debug(f'Loading font "{font_name}" ({size}pt)')
+        return ImageFont.truetype(FontFactory._get_font_path(font_name), size, encoding="unic", **kwargs)
+
+
+fonts = FontRegistry()
+
+
 class FontFactory:
     @staticmethod
     def _get_font_path(font_name: str) -> str:
         return f'{FONT_PATH}/{font_name}'
 
+    @staticmethod
+    def preload(sizes_by_face: dict):
+        """
+        Warm the registry, e.g. `FontFactory.preload({'black': (36, 40), 'regular': (44,)})`
+        """
+        for face, sizes in sizes_by_face.items():
+            for size in sizes:
+                getattr(FontFactory, face)(size)
+
     @staticmethod
     def polebg(size=32, **kwargs) -> ImageFont.FreeTypeFont:
-        return ImageFont.truetype(FontFactory._get_font_path(POLEBG_FONT_NAME), size, encoding="unic", **kwargs)
+        return fonts.get(POLEBG_FONT_NAME, size, **kwargs)
 
     @staticmethod
     def regular(size=32, **kwargs) -> ImageFont.FreeTypeFont:
-        return ImageFont.truetype(FontFactory._get_font_path(REGULAR_FONT_NAME), size, encoding="unic", **kwargs)
+        return fonts.get(REGULAR_FONT_NAME, size, **kwargs)
 
     @staticmethod
     def bold(size=32, **kwargs) -> ImageFont.FreeTypeFont:
-        return ImageFont.truetype(FontFactory._get_font_path(BOLD_FONT_NAME), size, encoding="unic", **kwargs)
+        return fonts.get(BOLD_FONT_NAME, size, **kwargs)
 
     @staticmethod
     def black(size=32, **kwargs) -> ImageFont.FreeTypeFont:
-        return ImageFont.truetype(FontFactory._get_font_path(BLACK_FONT_NAME), size, encoding="unic", **kwargs)
+        return fonts.get(BLACK_FONT_NAME, size, **kwargs)
 
     @staticmethod
     def wide(size=32, **kwargs) -> ImageFont.FreeTypeFont:
-        return ImageFont.truetype(FontFactory._get_font_path(WIDE_FONT_NAME), size, encoding="unic", **kwargs)
\ No newline at end of file
+        return fonts.get(WIDE_FONT_NAME, size, **kwargs)
@@ -2,8 +2,9 @@ from helpers.reader import Reader
 from helpers.calendar_reader import CalendarReader
 from helpers.general_ranking_reader import GeneralRankingReader
 from helpers.renderer import Renderer
-from helpers.command import Command
+from helpers.command import Command, setup_sheets
 from helpers.generator_config import GeneratorType
+from helpers.timing import tracer
 import os.path
 
 import logging
@@ -18,11 +19,15 @@ logging.basicConfig(
 _logger = logging.getLogger(__name__)
 
 args = Command().parse_args()
+tracer.recording = bool(args.trace)
+setup_sheets(args)
 if args.type in GENERAL_RANKING_TYPES:
     config = GeneralRankingReader(args.type, args.input, args.output, args.season, args.metric).read()
 elif args.type == 'calendar':
     config = CalendarReader(args.type, args.input, args.output, args.season).read()
 else:
     config = Reader(args.type, args.input, args.sheet, args.output).read()
-output_filepath = Renderer.render(config)
+output_filepath = Renderer.render(config, use_cache=not args.no_cache)
 _logger.info(f'Image successfully rendered in file "{os.path.realpath(output_filepath)}"')
+if args.trace:
+    tracer.save(args.trace)
@@ -1,25 +1,59 @@
 from abc import ABC, abstractmethod
+from font_factory import FontFactory
+from helpers.assets import assets
+from helpers.timing import span
+from helpers.transform import to_buffer
 from models import Visual
 from helpers.generator_config import GeneratorConfig
 from PIL import Image
 from PIL.PngImagePlugin import PngImageFile
 
 class AbstractGenerator(ABC):
+    # Font sizes drawn by the visual, by FontFactory face, e.g. {'black': (36, 40)}
+    preloaded_fonts = {}
+
     def __init__(self, config:GeneratorConfig):
         self.config = config
 
+    @classmethod
+    def preload(cls):
+        FontFactory.preload(cls.preloaded_fonts)
+
+    @classmethod
+    def build_sprites(cls):
+        """
+        Draw ahead of time the sprites (see `helpers.sprites`) the visual is
+        assembled from, for the pilots and teams of data.py
+        """
+        pass
+
     def generate(self):
-        base_img = self._generate_basic_image()
-        title_img = self._generate_title_image(base_img)
-        if title_img:
-            if title_img.mode == 'RGB':
-                base_img.paste(title_img)
-            else:
-                base_img.paste(title_img, title_img)
-        self._add_content(base_img)
-        base_img.save(self.config.output, quality=95)
+        base_img = self.generate_image()
+        with span('encode'):
+            base_img.save(self.config.output, quality=95)
         return self.config.output
 
+    def generate_buffer(self, image_format: str = 'PNG'):
+        base_img = self.generate_image()
+        with span('encode'):
+            return to_buffer(base_img, image_format, quality=95)
+
+    def generate_image(self) -> PngImageFile:
+        with span('preload'):
+            self.preload()
+        with span('basic_image'):
+            base_img = self._generate_basic_image()
+        with span('title'):
+            title_img = self._generate_title_image(base_img)
+            if title_img:
+                if title_img.mode == 'RGB':
+                    base_img.paste(title_img)
+                else:
+                    base_img.paste(title_img, title_img)
+        with span('content'):
+            self._add_content(base_img)
+        return base_img
+
     def _generate_title_image(self, base_img: PngImageFile) -> PngImageFile:
         visual = Visual(self._get_visual_type(), race=self.config.race)
         width = self._get_visual_title_width(base_img)
@@ -27,10 +61,9 @@ class AbstractGenerator(ABC):
         return visual.get_title_image(width, height)
 
     def _generate_basic_image(self) -> PngImageFile:
-        with Image.open('assets/bg.png') as bg:
-            base = bg.copy().convert('RGB')
-        with Image.open('assets/bgmetal.png') as gray_filter:
-            gray_filter = gray_filter.copy().resize((base.width, base.height)).convert('RGBA')
+        base = assets.get('assets/bg.png').convert('RGB')
+        gray_filter = assets.resized('assets/bgmetal.png', base.width, base.height, keep_ratio=False,
+                                     resample=Image.Resampling.BICUBIC).convert('RGBA')
         gray_filter.putalpha(150)
         base.paste(gray_filter, gray_filter)
         return base
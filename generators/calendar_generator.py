@@ -1,11 +1,17 @@
 import math
 from PIL import Image
 from PIL.PngImagePlugin import PngImageFile
+from helpers.assets import assets
+from helpers.sprites import sprites
 from helpers.transform import *
 from generators.abstract_generator import AbstractGenerator
 from models import Visual
 
+FLAG_SIZE = 65
+
 class CalendarGenerator(AbstractGenerator):
+    preloaded_fonts = {'black': (20, 24, 36, 114), 'regular': (16, 18)}
+
     def _get_visual_type(self) -> str:
         return 'calendar'
 
@@ -15,9 +21,7 @@ class CalendarGenerator(AbstractGenerator):
     def _generate_basic_image(self) -> PngImageFile:
         width = 1080 
         height = 1080
-        img = Image.new('RGB', (width, height), (255, 255, 255))
-        draw_lines_all(img, (159, 159, 159), space_between_lines=5, line_width=1)
-        return img
+        return hatched_image((width, height), (255, 255, 255), (159, 159, 159), space_between_lines=5, line_width=1)
 
     def _generate_title_image(self, base_img: PngImageFile) -> PngImageFile:
         return None
@@ -46,6 +50,19 @@ class CalendarGenerator(AbstractGenerator):
                 top = race_position.bottom + 15
 
     def _get_race_image(self, race:dict, width: int, height: int) -> PngImageFile:
+        """
+        Tile of `race`, drawn again only when one of the race fields or
+        circuit attributes it shows changes (e.g. a rescheduled race)
+        """
+        circuit = race['circuit']
+        key = ('calendar.race', width, height, race['index'], race['type'], race['date'])
+        assets_used = ()
+        if circuit:
+            key += (circuit.id, circuit.name, circuit.city)
+            assets_used = (circuit.get_flag_path(),)
+        return sprites.get(key, lambda: self._draw_race_image(race, width, height), assets=assets_used)
+
+    def _draw_race_image(self, race:dict, width: int, height: int) -> PngImageFile:
         img = Image.new('RGBA', (width, height), (0,0,0,0))
         left_width = int(0.20 * width)
         right_width = width - left_width
@@ -70,21 +87,21 @@ class CalendarGenerator(AbstractGenerator):
         round_text = text(f"R{race['index']}", (255, 255, 255), FontFactory.black(36))
         paste(round_text, left_img, top=(height-round_text.height)//2-3,use_obj=True)
 
+        type_font = FontFactory.regular(16)
         if type_txt in ('SPRINT', '100%') :
-            type_txt_img = text(type_txt, (255,255,255), FontFactory.regular(16))
+            type_txt_img = text(type_txt, (255,255,255), type_font)
             paste(type_txt_img, left_img, top=height-type_txt_img.height - 10)
         elif type_txt == 'DOUBLE GRID':
-            type_txt_img = text('DOUBLE', (255,255,255), FontFactory.regular(16))
+            type_txt_img = text('DOUBLE', (255,255,255), type_font)
             paste(type_txt_img, left_img, top=10)
-            type_txt_img = text('GRID', (255,255,255), FontFactory.regular(16))
+            type_txt_img = text('GRID', (255,255,255), type_font)
             paste(type_txt_img, left_img, top=height-type_txt_img.height - 10)
 
         # right part
         circuit = race['circuit']
         if circuit:
-            with circuit.get_flag() as circuit_flag:
-                flag = resize(circuit_flag, 65, 65, keep_ratio=True)
-                flag_position = paste(flag, right_img, left=15, use_obj=True)
+            flag = assets.resized(circuit.get_flag_path(), FLAG_SIZE, FLAG_SIZE, keep_ratio=True)
+            flag_position = paste(flag, right_img, left=15, use_obj=True)
             info_left = flag_position.right + 15
         else:
             info_left = 95
@@ -107,6 +124,10 @@ class CalendarGenerator(AbstractGenerator):
         return img
 
     def _get_title_image(self, width: int, height: int) -> PngImageFile:
+        key = ('calendar.title', width, height, self.config.season)
+        return sprites.get(key, lambda: self._draw_title_image(width, height), assets=('assets/fbrt_no_border.png',))
+
+    def _draw_title_image(self, width: int, height: int) -> PngImageFile:
         img = Image.new('RGBA', (width, height), (0,0,0,0))
         left = 50
         color = (31, 31, 31)
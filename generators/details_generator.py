@@ -1,18 +1,16 @@
 from PIL import Image, ImageDraw
 from PIL.PngImagePlugin import PngImageFile
+from helpers.assets import assets
 from helpers.transform import *
 from models import PilotResult
 
 from font_factory import FontFactory
 from generators.abstract_generator import AbstractGenerator
 
-small_font = FontFactory.regular(32)
-font = FontFactory.regular(38)
-big_font = FontFactory.regular(56)
-pilot_font = FontFactory.bold(30)
-
 
 class DetailsGenerator(AbstractGenerator):
+    preloaded_fonts = {'regular': (25, 30, 32, 50), 'bold': (30, 40, 45, 60)}
+
     def _get_visual_type(self) -> str:
         return 'details'
 
@@ -46,9 +44,8 @@ class DetailsGenerator(AbstractGenerator):
 
     def _get_fastest_lap_image(self, width: int, height: int):
         img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        with Image.open(f'assets/fastest_lap.png') as fstst_img:
-            fstst_img = resize(fstst_img, height, height)
-            paste(fstst_img, img, 0)
+        fstst_img = assets.resized('assets/fastest_lap.png', height, height)
+        paste(fstst_img, img, 0)
 
         draw = ImageDraw.Draw(img)
         text_font = FontFactory.bold(40)
@@ -68,8 +65,7 @@ class DetailsGenerator(AbstractGenerator):
         pilot_bg_left = (black_box_left + black_box_width)
         pilot_bg_width = width - pilot_bg_left
         pilot_bg = Image.new('RGB', (pilot_bg_width, height), (20, 20, 20))
-        alpha = Image.linear_gradient('L').rotate(-90).resize((pilot_bg_width, height))
-        pilot_bg.putalpha(alpha)
+        pilot_bg.putalpha(gradient_mask(pilot_bg_width, height, GradientDirection.LEFT_TO_RIGHT))
         img.paste(pilot_bg, (pilot_bg_left, 0))
 
         pilot_and_lap_padding = 20
@@ -95,9 +91,8 @@ class DetailsGenerator(AbstractGenerator):
 
         team_left = time_left + time_width + 40
         pilot = self.config.race.get_pilot(self.config.fastest_lap.pilot.name)
-        with Image.open(pilot.get_team_image()) as team_img:
-            team_img.thumbnail((height, height), Image.Resampling.LANCZOS)
-            img.paste(team_img, (team_left, 0), team_img)
+        team_img = assets.resized(pilot.get_team_image(), height, height)
+        img.paste(team_img, (team_left, 0), team_img)
         return img
 
     def _get_ranking_image(self, width: int, height: int):
@@ -112,22 +107,23 @@ class DetailsGenerator(AbstractGenerator):
         first_col_left = padding_left
         second_col_left = padding_left + col_width + padding_between
 
+        small_font = FontFactory.regular(32)
         maximum_split_size = 0
-        for _, pilot_data in self.config.ranking.iterrows():
-            if pilot_data[1] is not None:
-                _, _, w, h = ImageDraw.Draw(img).textbbox((0, 0), pilot_data[1], small_font)
+        rows = list(self.config.ranking.itertuples())
+        for _, _, split, _, _ in rows:
+            if split is not None:
+                w, h = text_size(split, small_font)
                 if w > maximum_split_size:
                     maximum_split_size = w
-        for index, pilot_data in self.config.ranking.iterrows():
+        for index, pilot_name, split, tyres, _ in rows:
             # Get pilot
-            pilot_name = pilot_data[0]
             pilot = self.config.race.get_pilot(pilot_name)
 
             pos = index + 1
             if pilot:
                 has_fastest_lap = pilot_name == self.config.fastest_lap.pilot.name
-                tyres = pilot_data[2] if isinstance(pilot_data[2], str) else ''
-                pilot_result = PilotResult(pilot, pos, pilot_data[1], tyres)
+                tyres = tyres if isinstance(tyres, str) else ''
+                pilot_result = PilotResult(pilot, pos, split, tyres)
 
                 left = first_col_left if index % 2 == 0 else second_col_left
                 pilot_result_image = pilot_result.get_details_image(col_width, row_height, maximum_split_size, has_fastest_lap, with_fastest_img=False)
@@ -8,25 +8,27 @@ from helpers.generator_config import GeneratorConfig
 from datetime import datetime, time
 from font_factory import FontFactory
 from generators.abstract_generator import AbstractGenerator
+from helpers.assets import assets
 from helpers.transform import *
 
 
 class FastestGenerator(AbstractGenerator):
+    preloaded_fonts = {'regular': (20, 23, 36, 40, 60), 'bold': (30, 33, 50, 60, 75, 100, 150)}
     DEFAULT_TIME_STR = '--:--.---'
     DEFAULT_TIME = datetime.strptime('5:59.999','%M:%S.%f').time()
 
     def __init__(self, config: GeneratorConfig):
         super().__init__(config)
         ranking_data = []
-        for index, pilot_data in self.config.ranking.iterrows():
+        for index, pilot_name, split, tyres, lap_time in self.config.ranking.itertuples():
             pos = index + 1
-            if pilot_data[3] is None or pilot_data[3] == self.DEFAULT_TIME_STR:
+            if lap_time is None or lap_time == self.DEFAULT_TIME_STR:
                 fastest_time = self.DEFAULT_TIME
             else:
-                fastest_time = datetime.strptime(pilot_data[3], '%M:%S.%f').time()
+                fastest_time = datetime.strptime(lap_time, '%M:%S.%f').time()
             ranking_data.append({
                 'time': fastest_time,
-                'pilot_result': PilotResult(self.config.race.get_pilot(pilot_data[0]), pos, pilot_data[1], pilot_data[2]),
+                'pilot_result': PilotResult(self.config.race.get_pilot(pilot_name), pos, split, tyres),
             })
         self.ranking = sorted(ranking_data, key=lambda x: x['time'])
 
@@ -91,14 +93,13 @@ class FastestGenerator(AbstractGenerator):
         circuit_name_font = FontFactory.regular(60)
         circuit_name_img = text(self.config.race.circuit.name, circuit_name_color, circuit_name_font)
 
-        with Image.open(f'assets/circuits/flags/{self.config.race.circuit.id}.png') as flag_img:
-            flag_img = resize(flag_img, width-circuit_name_img.width, circuit_name_img.height)
-            space_between = 10
-            circuit_name_left = (width - (circuit_name_img.width + flag_img.width + space_between)) // 2
-            flag_left = circuit_name_left + circuit_name_img.width + space_between
-            flag_top = circuit_name_top + (circuit_name_img.height - flag_img.height) // 2
-            img.paste(circuit_name_img, (circuit_name_left, circuit_name_top))
-            img.paste(flag_img, (flag_left, flag_top), flag_img)
+        flag_img = self.config.race.context.flag(width-circuit_name_img.width, circuit_name_img.height)
+        space_between = 10
+        circuit_name_left = (width - (circuit_name_img.width + flag_img.width + space_between)) // 2
+        flag_left = circuit_name_left + circuit_name_img.width + space_between
+        flag_top = circuit_name_top + (circuit_name_img.height - flag_img.height) // 2
+        img.paste(circuit_name_img, (circuit_name_left, circuit_name_top))
+        img.paste(flag_img, (flag_left, flag_top), flag_img)
 
         v_padding = 20
         length_color = (180, 180, 180)
@@ -111,9 +112,8 @@ class FastestGenerator(AbstractGenerator):
         map_left = 20
         map_top = length_top + length_img.height + v_padding
         map_height = height - map_top
-        with Image.open(f'assets/circuits/maps/{self.config.race.circuit.id}.png') as map:
-            map = resize(map, width, map_height)
-            img.paste(map, (map_left, map_top), map)
+        map = self.config.race.context.map(width, map_height)
+        img.paste(map, (map_left, map_top), map)
         return img
 
     def _get_fastest_lap_img(self, position: int, width: int, height: int, lap_time: time, pilot_result: PilotResult):
@@ -220,9 +220,8 @@ class FastestGenerator(AbstractGenerator):
             if os.path.exists(img_path):
                 break
 
-        with Image.open(img_path) as team_pilot_img:
-            team_pilot_img.thumbnail((width, height), Image.Resampling.LANCZOS)
-            paste(team_pilot_img, img, left=0, use_obj=True)
+        team_pilot_img = assets.resized(img_path, width, height)
+        paste(team_pilot_img, img, left=0, use_obj=True)
 
         team_font = FontFactory.bold(50 if position == 1 else 30)
         team_img = pilot_result.pilot.team.get_team_image(width, team_font)
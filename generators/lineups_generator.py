@@ -4,6 +4,8 @@ from generators.abstract_generator import AbstractGenerator
 
 
 class LineupGenerator(AbstractGenerator):
+    preloaded_fonts = {'regular': (20, 38), 'bold': (28, 68)}
+
     def _get_visual_type(self) -> str:
         return 'lineups'
 
@@ -1,6 +1,9 @@
+import os
 from PIL import Image
 from PIL.PngImagePlugin import PngImageFile
 from models import Pilot
+from helpers.assets import assets
+from helpers.timing import span
 from helpers.transform import *
 from generators.abstract_generator import AbstractGenerator
 
@@ -34,6 +37,12 @@ OFFICIAL_PILOTS_NUMBERS = {
 
 
 class NumbersGenerator(AbstractGenerator):
+    preloaded_fonts = {'black': (20,), 'regular': (30,)}
+    # redraw only the cells that changed since the last board of the process
+    incremental = True
+    # (layout, board, cell keys) of the last board rendered
+    _last_board = None
+
     def _get_visual_type(self) -> str:
         return 'numbers'
 
@@ -43,9 +52,7 @@ class NumbersGenerator(AbstractGenerator):
     def _generate_basic_image(self) -> PngImageFile:
         width = (1080 * 2) + 60
         height = 1440
-        img = Image.new('RGB', (width, height), (255, 255, 255))
-        draw_lines_all(img, (159, 159, 159), space_between_lines=10, line_width=2)
-        return img
+        return hatched_image((width, height), (255, 255, 255), (159, 159, 159), space_between_lines=10, line_width=2)
 
     def _generate_title_image(self, base_img: PngImageFile) -> PngImageFile:
         return None
@@ -61,24 +68,67 @@ class NumbersGenerator(AbstractGenerator):
         space_between_columns = 15
         line_width = (base_img.width - left_padding * 2 - amount_of_columns * space_between_columns) // amount_of_columns
         line_height = 55
+        owners = self._get_numbers_owners()
+        cells = []
         for i in range(MAX_NUMBER):
-            number_img = self._generate_number_image(i+1, line_width, line_height)
-            paste(number_img, base_img, left, top)
+            number = i + 1
+            pilot = owners.get(str(number))
+            cells.append((number, pilot, (left, top), self._get_cell_key(number, pilot)))
             if (i+1) % amount_of_lines_by_column == 0 and i > 0:
                 top = top_padding
                 left += line_width + space_between_columns
             else:
                 top += line_height + space_between_lines
 
-    def _generate_number_image(self, number, width, height):
+        # only the cells whose owner changed since the last board are redrawn
+        layout = (base_img.size, base_img.mode, line_width, line_height)
+        last_board = NumbersGenerator._last_board if self.incremental else None
+        if last_board and last_board[0] == layout:
+            _, board, last_keys = last_board
+            changed = [cell for cell, last_key in zip(cells, last_keys) if cell[3] != last_key]
+            backgrounds = [base_img.crop((left, top, left + line_width, top + line_height)) for _, _, (left, top), _ in changed]
+            base_img.paste(board)
+            for (_, _, position, _), background in zip(changed, backgrounds):
+                base_img.paste(background, position)
+        else:
+            changed = cells
+
+        for number, pilot, (left, top), _ in changed:
+            with span('numbers.cell'):
+                number_img = self._generate_number_image(number, line_width, line_height, pilot)
+                paste(number_img, base_img, left, top)
+        if self.incremental:
+            NumbersGenerator._last_board = (layout, base_img.copy(), [cell[3] for cell in cells])
+
+    def _get_numbers_owners(self) -> dict:
+        """
+        {number: pilot}, the first pilot of the config wins when a number is
+        taken twice
+        """
+        owners = {}
+        for pilot in self.config.pilots.values():
+            owners.setdefault(pilot.number, pilot)
+        return owners
+
+    def _get_cell_key(self, number: int, pilot: Pilot) -> tuple:
+        """
+        Everything the cell of `number` is drawn from
+        """
+        official_pilot_name = OFFICIAL_PILOTS_NUMBERS.get(str(number))
+        if official_pilot_name:
+            return (number, official_pilot_name)
+        if not pilot:
+            return (number,)
+        team = pilot.team
+        card_path = self._get_team_card_path(team)
+        return (number, pilot.name, team.name, team.main_color, team.secondary_color, team.standing_fg, os.stat(card_path).st_mtime_ns)
+
+    def _generate_number_image(self, number, width, height, pilot: Pilot = None):
         print_number = str(number) if number > 9 else f' {number}'
         is_official_pilot = False
         pilot_name = OFFICIAL_PILOTS_NUMBERS.get(str(number))
         if not pilot_name:
-            for pilot in self.config.pilots.values():
-                if pilot.number == str(number):
-                    pilot_name = pilot.name
-                    break
+            pilot_name = pilot.name if pilot else None
         else:
             is_official_pilot = True
         fill_color = (255, 255, 255)
@@ -92,8 +142,7 @@ class NumbersGenerator(AbstractGenerator):
                 stroke_color = (150, 150, 150)
 
         img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        font_size = 30
-        number_img = text(print_number, fill_color, FontFactory.regular(font_size), 3, stroke_color, security_padding=2)
+        number_img = text(print_number, fill_color, FontFactory.regular(30), 3, stroke_color, security_padding=2)
         number_pos = paste(number_img, img, left=0, use_obj=True)
         space_between = 20
         pilot_font = FontFactory.black(20)
@@ -108,10 +157,12 @@ class NumbersGenerator(AbstractGenerator):
             paste(pilot_img, img, left=name_left, with_alpha=False)
         return img
 
+    def _get_team_card_path(self, team) -> str:
+        return f'assets/teams/empty_cards/{team.name}.png'
+
     def _get_pilot_card_img(self, width: int, height: int, pilot: Pilot, font):
         img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        with Image.open(f'assets/teams/empty_cards/{pilot.team.name}.png') as i:
-            team_card_img = resize(i.copy(), width, height)
+        team_card_img = assets.resized(self._get_team_card_path(pilot.team), width, height)
         # pilot name
         paste(team_card_img, img, left=0, with_alpha=False)
         name_txt = text(pilot.name.upper(), pilot.team.standing_fg, font)
@@ -1,6 +1,8 @@
 from PIL import Image
 from generators.abstract_generator import AbstractGenerator
 
+from helpers.assets import assets
+from helpers.sprites import sprites
 from helpers.transform import *
 from font_factory import FontFactory
 from models import Pilot, Team, Visual
@@ -19,6 +21,8 @@ RESERVIST_TEAM = Team(
 PILOTS_BY_COLUMN = 13
 
 class PilotsRankingGenerator(AbstractGenerator):
+    preloaded_fonts = {'black': (40, 44, 70), 'regular': (36, 44)}
+
     def _get_visual_type(self) -> str:
         return 'ranking'
 
@@ -32,8 +36,8 @@ class PilotsRankingGenerator(AbstractGenerator):
 
     def _generate_title_image(self, base_img: PngImageFile) -> PngImageFile:
         height = self._get_visual_title_height()
-        with Image.open('assets/rankings/bg_top.png') as img:
-            img = resize(img.copy().convert('RGB'), base_img.width, height, keep_ratio=False)
+        img = assets.resized('assets/rankings/bg_top.png', base_img.width, height, keep_ratio=False,
+                             resample=Image.Resampling.BICUBIC, mode='RGB').copy()
 
         left_img = self._generate_left_title_image(base_img.width // 3, height)
         left_img_pos = paste(left_img, img, use_obj=True, left=0)
@@ -93,22 +97,24 @@ class PilotsRankingGenerator(AbstractGenerator):
             data_type = int
         else:
             data_type = float
-        self.config.ranking[self.config.metric] = self.config.ranking[self.config.metric].str.replace(',','.').astype(data_type)
-        i = 0
-        for _, row in self.config.ranking.sort_values(by=self.config.metric, ascending=False).iterrows():
+        points = self.config.ranking[self.config.metric].str.replace(',','.').astype(data_type)
+        ranking = self.config.ranking.assign(**{self.config.metric: points})
+        ranking = ranking.sort_values(by=self.config.metric, ascending=False)
+        for i, (pilot_name, pilot_points) in enumerate(zip(ranking['Pilot'], ranking[self.config.metric])):
             if i % PILOTS_BY_COLUMN == 0 and i > 0:
                 current_top = title_height+padding_top
                 current_left += column_width + padding_between_cols
-            pilot_ranking_img = self._get_pilot_ranking_img(column_width, row_height, row['Pilot'], row[self.config.metric], i+1)
+            pilot_ranking_img = self._get_pilot_ranking_img(column_width, row_height, pilot_name, pilot_points, i+1)
             _, _, _, r_bottom = paste(pilot_ranking_img, base_img, left=current_left, top=current_top)
             current_top = r_bottom + padding_between_rows
-            i += 1
 
     def _get_pilot_ranking_img(self, width:int, height:int, pilot_name, points, pos):
         img = Image.new('RGBA', (width, height), (0,0,0,0))
 
         # [POS] [TEAM CARD + PILOT] [PTS]
         #  15%        65%            20%
+        # each part is a sprite, only the position and points ones change
+        # from a week to the next
 
         padding_between = 20
         effective_width = width - 2 * padding_between
@@ -120,37 +126,55 @@ class PilotsRankingGenerator(AbstractGenerator):
         pos_txt = self._get_pos_img(position_width, height, pos)
         pos_position = paste(pos_txt, img, left=0, use_obj=True)
 
-        # TEAM
+        # TEAM + pilot name
         pilot = self.config.pilots.get(pilot_name)
         if not pilot:
             pilot = Pilot(name=pilot_name, team=RESERVIST_TEAM, number='RE')
-        team_card_img = self._get_team_card_img(pilot_width, height, pilot.team)
-        team_name_left, _, team_name_right, _ = paste(team_card_img, img, left=pos_position.right+padding_between, with_alpha=False)
-
-        # pilot name
-        pilot_font = FontFactory.black(36 if PILOTS_BY_COLUMN >= 14 else 40)
-        team_txt = text(pilot.name.upper(), pilot.team.standing_fg, pilot_font)
-        paste(team_txt, img, team_name_left+225)
+        pilot_card_img = self._get_pilot_card_img(pilot_width, height, pilot, padding_between)
+        _, _, pilot_card_right, _ = paste(pilot_card_img, img, left=pos_position.right+padding_between, top=0, with_alpha=False)
 
         # POINTS
         points_txt = self._get_points_img(points_width, height, str(points))
-        paste(points_txt, img, left=team_name_right + padding_between)
+        paste(points_txt, img, left=pilot_card_right)
 
         return img
 
+    def _get_pilot_card_img(self, width:int, height: int, pilot:Pilot, padding_right:int):
+        """
+        Team card with the pilot name on it, followed by `padding_right`
+        transparent pixels (where a long name may overflow)
+        """
+        card_path = f'assets/teams/empty_cards/{pilot.team.name}.png'
+        pilot_font_size = 36 if PILOTS_BY_COLUMN >= 14 else 40
+        def draw():
+            team_card_img = self._get_team_card_img(width, height, pilot.team)
+            img = Image.new('RGBA', (team_card_img.width + padding_right, height), (0,0,0,0))
+            paste(team_card_img, img, left=0, with_alpha=False)
+            pilot_font = FontFactory.black(pilot_font_size)
+            team_txt = text(pilot.name.upper(), pilot.team.standing_fg, pilot_font)
+            paste(team_txt, img, 225)
+            return img
+        key = ('pilots_ranking.card', width, height, padding_right, pilot.name, pilot.team.name, pilot.team.standing_fg, pilot_font_size)
+        return sprites.get(key, draw, assets=(card_path,))
+
     def _get_team_card_img(self, width:int, height: int, team:Team):
-        with Image.open(f'assets/teams/empty_cards/{team.name}.png') as img:
-            return img.copy()
+        return assets.get(f'assets/teams/empty_cards/{team.name}.png')
 
     def _get_points_img(self, width:int, height: int, points:str):
+        return sprites.get(('pilots_ranking.points', width, height, points), lambda: self._draw_points_img(width, height, points))
+
+    def _draw_points_img(self, width:int, height: int, points:str):
         img = Image.new('RGB', (width, height), (255, 255, 255))
-        font_size = self._determine_font_size(points, img, Font=FontFactory.black, initial_font_size=44)
+        font_size = get_max_font_size(points, width, height, Font=FontFactory.black, initial_font_size=44)
         points_font = FontFactory.black(font_size)
         points_txt = text(points, (0,0,0), points_font)
         paste(points_txt, img, top=(height-points_txt.height)//2 - 4)
         return img
 
     def _get_pos_img(self, width:int, height: int, pos:int):
+        return sprites.get(('pilots_ranking.pos', width, height, pos, PILOTS_BY_COLUMN), lambda: self._draw_pos_img(width, height, pos))
+
+    def _draw_pos_img(self, width:int, height: int, pos:int):
         pos = self._pos_to_ordinal(pos)
         img = Image.new('RGB', (width, height), (0, 0, 0))
 
@@ -168,15 +192,3 @@ class PilotsRankingGenerator(AbstractGenerator):
     def _pos_to_ordinal(self, n):
         suffix = {1: 'ST', 2: 'ND', 3: 'RD'}.get(4 if 10 <= n % 100 < 20 else n % 10, "TH")
         return f'{n}{suffix}'
-
-    def _determine_font_size(self, text, img, Font=FontFactory.regular, initial_font_size=20):
-        font_size = initial_font_size
-        txt_width, txt_height = text_size(text, Font(font_size), img)
-        height_offset = 10
-        while txt_width <= img.width-height_offset and txt_height <= img.height-height_offset:
-            font_size += 1
-            txt_width, txt_height = text_size(text, Font(font_size), img)
-        while txt_width >= img.width and txt_height >= img.height:
-            font_size -= 1
-            txt_width, txt_height = text_size(text, Font(font_size), img)
-        return font_size + 1
@@ -8,10 +8,13 @@ from helpers.generator_config import GeneratorConfig
 from datetime import datetime, time
 from font_factory import FontFactory
 from generators.abstract_generator import AbstractGenerator
+from helpers.assets import assets
 from helpers.transform import *
 
 
 class PoleGenerator(AbstractGenerator):
+    preloaded_fonts = {'black': (24, 360), 'polebg': (200,)}
+
     def _get_pole_pilot(self) -> Pilot:
         return self.config.qualif_ranking[0]
 
@@ -23,16 +26,13 @@ class PoleGenerator(AbstractGenerator):
 
     def _generate_basic_image(self) -> PngImageFile:
         pole_pilot = self._get_pole_pilot()
-        with Image.open('assets/pole/bg.png') as img:
-            base = Image.new('RGB', (img.width, img.height), color=pole_pilot.team.get_pole_colors()['bg'])
-        return base
+        img = assets.get('assets/pole/bg.png')
+        return Image.new('RGB', (img.width, img.height), color=pole_pilot.team.get_pole_colors()['bg'])
 
     def _get_pilot_image(self, pilot:Pilot, width, height):
         img = Image.new('RGBA', (width, height), (0,0,0,0))
         img_path = pilot.get_celebrating_image()
-        with Image.open(img_path) as team_pilot_img:
-            img = resize(team_pilot_img, width, height)
-            return img.copy()
+        return assets.resized(img_path, width, height)
 
     def _get_podium_img(self):
         first = self._get_pole_pilot()
@@ -65,7 +65,7 @@ class PoleGenerator(AbstractGenerator):
     def _add_content(self, final: PngImageFile):
         pole_pilot = self._get_pole_pilot()
         colors = pole_pilot.team.get_pole_colors()
-        draw_lines(final, colors['line'], space_between_lines=10, line_width=2)
+        paste(hatched_image(final.size, colors['bg'], colors['line'], space_between_lines=10, line_width=2, pattern=draw_lines), final, 0, 0)
         repeat_text(final, (0,0,0, 177), pole_pilot.name.upper(), Font=FontFactory.polebg, font_size=200)
 
         with Visual.get_fbrt_logo(True) as logo:
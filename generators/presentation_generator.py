@@ -2,21 +2,21 @@ from PIL import Image
 from font_factory import FontFactory
 from generators.abstract_generator import AbstractGenerator
 
+from helpers.assets import assets
 from helpers.transform import *
 import textwrap
 
 class PresentationGenerator(AbstractGenerator):
+    preloaded_fonts = {'regular': (32, 34, 50, 60), 'bold': (40, 68, 80)}
+
     def _get_visual_type(self) -> str:
         return 'presentation'
 
     def _generate_basic_image(self) -> PngImageFile:
-        with Image.open('assets/bg.png') as original_bg:
-            base = original_bg.copy().convert('RGB')
-            # BG
-            bg = Image.new('RGB', (base.width, base.height), (150, 150, 150))
-            alpha = Image.linear_gradient('L').rotate(-90).resize((base.width, base.height))
-            alpha = alpha.crop(((0, 0, base.width//2, base.height))).resize((base.width, base.height))
-            base.paste(bg, alpha)
+        base = assets.get('assets/bg.png').convert('RGB')
+        # BG
+        bg = Image.new('RGB', (base.width, base.height), (150, 150, 150))
+        base.paste(bg, gradient_mask(base.width, base.height, GradientDirection.LEFT_TO_RIGHT, span=(0, 0.5)))
         return base
 
     def _add_content(self, final: PngImageFile):
@@ -67,8 +67,7 @@ class PresentationGenerator(AbstractGenerator):
 
         # Title BG
         bg = Image.new('RGB', (width, date_bottom), (100, 100, 100))
-        alpha = Image.linear_gradient('L').rotate(-90).resize((width, date_bottom))
-        bg.putalpha(alpha)
+        bg.putalpha(gradient_mask(width, date_bottom, GradientDirection.LEFT_TO_RIGHT))
         img.paste(bg)
 
         # horizontal top line
@@ -94,16 +93,14 @@ class PresentationGenerator(AbstractGenerator):
         draw.text((name_left, name_top), self.config.race.circuit.name, title_color, title_font)
 
         # circuit flag
-        with Image.open(f'assets/circuits/flags/{self.config.race.circuit.id}.png') as flag:
-            flag.thumbnail((200,200), Image.Resampling.LANCZOS)
-            img.paste(flag, (hbline_right - flag.width, (date_bottom - flag.height)//2), flag)
+        flag = self.config.race.context.flag(200, 200)
+        img.paste(flag, (hbline_right - flag.width, (date_bottom - flag.height)//2), flag)
 
         # photo
         img_top = date_bottom + 20
         remaining_height = height - img_top
-        with Image.open(f'assets/circuits/photos/{self.config.race.circuit.id}.png') as photo:
-            photo = resize(photo, width-month_left, remaining_height)
-            paste_rounded(img, photo, (month_left, img_top))
+        photo = self.config.race.context.photo(width-month_left, remaining_height)
+        paste_rounded(img, photo, (month_left, img_top))
 
         # hour
         _, _, hour_width, hour_height = draw.textbbox((0, 0), self.config.race.hour, hour_font)
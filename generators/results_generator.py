@@ -7,13 +7,10 @@ from models import Pilot
 from data import DEFAULT_TEAM
 from font_factory import FontFactory
 
-small_font = FontFactory.regular(32)
-font = FontFactory.regular(38)
-big_font = FontFactory.regular(56)
-pilot_font = FontFactory.bold(30)
-
 
 class ResultsGenerator(AbstractGenerator):
+    preloaded_fonts = {'regular': (32, 38, 56), 'bold': (30, 68)}
+
     def _get_visual_type(self) -> str:
         return 'results'
 
@@ -26,13 +23,13 @@ class ResultsGenerator(AbstractGenerator):
         left_part_width = final.width - right_part_width
         left_part_height = final.height - title_height - race_title_height
         # get race title
-        race_title = self.config.race.get_title_image(left_part_width, left_part_height, font, big_font)
+        race_title = self.config.race.get_title_image(left_part_width, left_part_height, FontFactory.regular(38), FontFactory.regular(56))
         final.paste(race_title, (0, title_height+48), race_title)
 
         # get circuit image
         circuit_left = int(2 * (final.width / 3))
         circuit_top = title_height + 20
-        circuit_img = self.config.race.get_information_image(right_part_width, right_part_height, small_font)
+        circuit_img = self.config.race.get_information_image(right_part_width, right_part_height, FontFactory.regular(32))
         final.paste(circuit_img, (circuit_left, circuit_top), circuit_img)
 
         # get rankings image
@@ -59,7 +56,7 @@ class ResultsGenerator(AbstractGenerator):
             left = first_col_left if index % 2 == 0 else second_col_left
             if pilot:
                 has_fastest_lap = pilot_name == self.config.fastest_lap.pilot.name
-                ranking_pilot_image = pilot.get_ranking_image(pos, col_width, row_height, small_font, pilot_font, has_fastest_lap)
+                ranking_pilot_image = pilot.get_ranking_image(pos, col_width, row_height, FontFactory.regular(32), FontFactory.bold(30), has_fastest_lap)
                 img.paste(ranking_pilot_image, (left, top))
                 top += hop_between_position
         return img
\ No newline at end of file
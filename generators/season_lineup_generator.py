@@ -1,13 +1,20 @@
 import math
 from PIL import Image, ImageDraw
 from PIL.PngImagePlugin import PngImageFile
+from font_factory import BLACK_FONT_NAME, BOLD_FONT_NAME, FONT_PATH
 from models import Pilot, Visual
+from helpers.generator_config import GeneratorConfig
+from helpers.sprites import sprites
 from helpers.transform import *
 from generators.abstract_generator import AbstractGenerator
 
 SEASON = 5
+# font files the (persisted) pilot cards are drawn with
+PILOT_CARD_FONTS = (f'{FONT_PATH}/{BLACK_FONT_NAME}', f'{FONT_PATH}/{BOLD_FONT_NAME}')
 
 class SeasonLineupGenerator(AbstractGenerator):
+    preloaded_fonts = {'black': (60, 70), 'bold': (25,)}
+
     def _get_visual_type(self) -> str:
         return 'season_lineup'
 
@@ -17,9 +24,13 @@ class SeasonLineupGenerator(AbstractGenerator):
     def _generate_basic_image(self) -> PngImageFile:
         width = 1080
         height = 1080
-        img = Image.new('RGB', (width, height), (255, 255, 255))
-        draw_lines_all(img, (159,159,159), space_between_lines=6, line_width=1)
-        return img
+        return hatched_image((width, height), (255, 255, 255), (159,159,159), space_between_lines=6, line_width=1)
+
+    @classmethod
+    def build_sprites(cls):
+        from data import pilots, teams
+        generator = cls(GeneratorConfig(type='season_lineup', output=None, pilots=pilots, teams=teams))
+        generator._add_content(generator._generate_basic_image())
 
     def _generate_title_image(self, base_img: PngImageFile) -> PngImageFile:
         return None
@@ -53,6 +64,10 @@ class SeasonLineupGenerator(AbstractGenerator):
                 odd_top = pilot_pos.bottom + padding_v
 
     def _get_title_img(self, width:int, height:int) -> PngImageFile:
+        key = ('season_lineup.title', width, height, SEASON)
+        return sprites.get(key, lambda: self._draw_title_img(width, height), assets=('assets/fbrt_no_border.png',))
+
+    def _draw_title_img(self, width:int, height:int) -> PngImageFile:
         img = Image.new('RGBA', (width, height), (0,0,0,0))
         with Visual.get_fbrt_logo(no_border=True) as logo:
             fbrt_logo = resize(logo, height, height)
@@ -62,6 +77,12 @@ class SeasonLineupGenerator(AbstractGenerator):
         return img
 
     def _get_pilot_img(self, pilot:Pilot, width:int, height:int) -> PngImageFile:
+        team = pilot.team
+        key = ('season_lineup.pilot', width, height, str(pilot.number or 'Re'), pilot.name,
+               team.main_color, team.secondary_color, team.standing_fg)
+        return sprites.get(key, lambda: self._draw_pilot_img(pilot, width, height), assets=PILOT_CARD_FONTS, persist=True)
+
+    def _draw_pilot_img(self, pilot:Pilot, width:int, height:int) -> PngImageFile:
         img = Image.new('RGBA', (width, height), (0,0,0,0))
         draw = ImageDraw.Draw(img)
         draw.line(((0, 0), (width, 0)), fill=(0,0,0,80), width=2)
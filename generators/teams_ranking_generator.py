@@ -1,12 +1,16 @@
 from PIL import Image
 from generators.abstract_generator import AbstractGenerator
 
+from helpers.assets import assets
+from helpers.sprites import sprites
 from helpers.transform import *
 from font_factory import FontFactory
 from models import Team, Visual
 from data import teams_idx
 
 class TeamsRankingGenerator(AbstractGenerator):
+    preloaded_fonts = {'black': (60, 80), 'regular': (30,)}
+
     def _get_visual_type(self) -> str:
         return 'ranking'
 
@@ -16,9 +20,13 @@ class TeamsRankingGenerator(AbstractGenerator):
         return Image.new('RGB', (width, height), (0,0,0))
 
     def _generate_title_image(self, base_img: PngImageFile) -> PngImageFile:
+        key = ('teams_ranking.title', base_img.width, self.config.ranking_title, self.config.ranking_subtitle)
+        return sprites.get(key, lambda: self._draw_title_image(base_img), assets=('assets/rankings/bg_top.png', 'assets/fbrt.png'))
+
+    def _draw_title_image(self, base_img: PngImageFile) -> PngImageFile:
         height = 300
-        with Image.open('assets/rankings/bg_top.png') as img:
-            img = resize(img.copy().convert('RGB'), base_img.width, height, keep_ratio=False)
+        img = assets.resized('assets/rankings/bg_top.png', base_img.width, height, keep_ratio=False,
+                             resample=Image.Resampling.BICUBIC, mode='RGB').copy()
 
         with Visual.get_fbrt_logo() as logo:
             logo = resize(logo, logo.width, img.height//2)
@@ -43,8 +51,8 @@ class TeamsRankingGenerator(AbstractGenerator):
         row_height = ((base_img.height - 300 - padding_top) // 10) - padding_between_rows
         # row_height = 87
         current_top = title_height+padding_top
-        for _, row in self.config.ranking.iterrows():
-            team_ranking_img = self._get_team_ranking_img(width, row_height, row['Ecurie'], row['Total'])
+        for team_name, points in zip(self.config.ranking['Ecurie'], self.config.ranking['Total']):
+            team_ranking_img = self._get_team_ranking_img(width, row_height, team_name, points)
             _, _, _, r_bottom = paste(team_ranking_img, base_img, top=current_top)
             current_top = r_bottom + padding_between_rows
 
@@ -63,21 +71,12 @@ class TeamsRankingGenerator(AbstractGenerator):
         return img
 
     def _get_team_img(self, width:int, height: int, team:Team):
-        with Image.open(f'assets/teams/cards/{team.name}.png') as img:
-            return img.copy()
-        img = Image.new('RGB', (width, height), team.standing_bg)
-        # logo
-        with Image.open(team.get_image()) as logo:
-            logo = resize(logo.copy(), width//3, height-10)
-            _, _, logo_right, _ = paste(logo, img, left=10)
-
-        #text
-        team_font = FontFactory.black(54)
-        team_txt = text(team.title.upper(), team.standing_fg, team_font)
-        paste(team_txt, img, logo_right+40)
-        return img
+        return assets.get(f'assets/teams/cards/{team.name}.png')
 
     def _get_points_img(self, width:int, height: int, points:str):
+        return sprites.get(('teams_ranking.points', width, height, points), lambda: self._draw_points_img(width, height, points))
+
+    def _draw_points_img(self, width:int, height: int, points:str):
         img = Image.new('RGB', (width, height), (255, 255, 255))
         points_font = FontFactory.black(80)
         points_txt = text(points, (0,0,0), points_font)
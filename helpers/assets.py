@@ -0,0 +1,168 @@
+import hashlib
+import json
+import logging
+import os
+from PIL import Image
+from helpers.cache import LRUCache, atomic_write, image_bytes
+from helpers.timing import timed
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_CACHE_DIR = '.cache/assets'
+VARIANTS_DIR = 'variants'
+
+
+class AssetStore:
+    """
+    Process-wide store of decoded images from `assets/`.
+
+    Each file is decoded once (until it changes on disk or is evicted to stay
+    under `max_bytes`). `get` hands out the shared decoded image, which callers
+    must treat as read-only; `open` hands out a private copy for callers that
+    modify it in place (e.g. `thumbnail`), which is a memory copy instead of a
+    PNG decode.
+
+    `resized` serves resized variants of an asset, which are also persisted
+    in `cache_dir` (keyed by source path, mtime, size and resample mode) so
+    they survive restarts. Set `cache_dir` to None to keep them in memory only.
+    Each variant spec is recorded in its own file of `cache_dir/variants`, so
+    concurrent processes never overwrite each other's records.
+    """
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._images = LRUCache(maxsize=None, max_weight=max_bytes, weigher=image_bytes)
+
+    @property
+    def max_bytes(self) -> int:
+        return self._images.max_weight
+
+    @max_bytes.setter
+    def max_bytes(self, value: int):
+        self._images.max_weight = value
+
+    def get(self, path: str) -> Image.Image:
+        path = os.path.normpath(path)
+        key = (path, os.stat(path).st_mtime_ns)
+        return self._images.get_or_create(key, lambda: self._load(path))
+
+    def open(self, path: str) -> Image.Image:
+        return self.get(path).copy()
+
+    def resized(self, path: str, width: int, height: int, keep_ratio: bool = True,
+                resample: int = Image.Resampling.LANCZOS, mode: str = None) -> Image.Image:
+        """
+        Shared read-only variant of `path`, converted to `mode` if given then
+        either thumbnailed into `width`x`height` (keep_ratio) or resized to it.
+        """
+        path = os.path.normpath(path)
+        spec = {
+            'path': path,
+            'width': width,
+            'height': height,
+            'keep_ratio': keep_ratio,
+            'resample': int(resample),
+            'mode': mode
+        }
+        mtime = os.stat(path).st_mtime_ns
+        key = ('resized', mtime) + tuple(spec.values())
+        return self._images.get_or_create(key, lambda: self._load_variant(spec, mtime))
+
+    def variants(self) -> list:
+        """
+        Specs of every resized variant requested so far, see `resized`
+        """
+        if not self.cache_dir:
+            return []
+        variants_dir = os.path.join(self.cache_dir, VARIANTS_DIR)
+        if not os.path.isdir(variants_dir):
+            return []
+        variants = []
+        for filename in sorted(os.listdir(variants_dir)):
+            if filename.endswith('.json'):
+                with open(os.path.join(variants_dir, filename)) as f:
+                    variants.append(json.load(f)['spec'])
+        return variants
+
+    def preload(self, variants: list = None):
+        """
+        Load `variants` (every recorded variant by default) into memory,
+        rebuilding the ones whose source changed since they were cached
+        """
+        for variant in self.variants() if variants is None else variants:
+            try:
+                self.resized(**variant)
+            except FileNotFoundError:
+                _logger.warning(f'Skipping variant of missing asset "{variant["path"]}"')
+
+    def clear(self):
+        self._images.clear()
+
+    def stats(self) -> dict:
+        stats = self._images.stats()
+        return {
+            'files': stats['size'],
+            'hits': stats['hits'],
+            'misses': stats['misses'],
+            'hit_rate': stats['hit_rate'],
+            'resident_bytes': stats['weight'],
+            'max_bytes': stats['max_weight'],
+        }
+
+    @timed('assets.decode')
+    def _load(self, path: str) -> Image.Image:
+        _logger.debug(f'Decoding asset "{path}"')
+        with Image.open(path) as img:
+            img.load()
+            return img
+
+    def _load_variant(self, spec: dict, mtime: int) -> Image.Image:
+        if not self.cache_dir:
+            return self._build_variant(spec)
+
+        spec_id = hashlib.sha1(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+        variant_id = hashlib.sha1(f'{spec_id}:{mtime}'.encode()).hexdigest()
+        variant_path = os.path.join(self.cache_dir, f'{variant_id}.png')
+        if os.path.exists(variant_path):
+            return self._load(variant_path)
+
+        img = self._build_variant(spec)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with atomic_write(variant_path) as f:
+            img.save(f, format='PNG', compress_level=1)
+        self._record_variant(spec_id, spec, variant_id)
+        return img
+
+    @timed('assets.resize')
+    def _build_variant(self, spec: dict) -> Image.Image:
+        _logger.debug(f'Resizing asset "{spec["path"]}" to {spec["width"]}x{spec["height"]}')
+        img = self.get(spec['path'])
+        img = img.convert(spec['mode']) if spec['mode'] else img.copy()
+        if spec['keep_ratio']:
+            img.thumbnail((spec['width'], spec['height']), spec['resample'])
+            return img
+        return img.resize((spec['width'], spec['height']), spec['resample'])
+
+    def _record_variant(self, spec_id: str, spec: dict, variant_id: str):
+        """
+        Record `spec` as cached in `variant_id`, deleting the variant it
+        supersedes (built from a previous version of the source)
+        """
+        variants_dir = os.path.join(self.cache_dir, VARIANTS_DIR)
+        entry_path = os.path.join(variants_dir, f'{spec_id}.json')
+        previous_id = None
+        if os.path.exists(entry_path):
+            with open(entry_path) as f:
+                previous_id = json.load(f)['variant']
+        if previous_id == variant_id:
+            return
+        os.makedirs(variants_dir, exist_ok=True)
+        with atomic_write(entry_path, 'w') as f:
+            json.dump({'spec': spec, 'variant': variant_id}, f, indent=1)
+        if previous_id:
+            try:
+                os.remove(os.path.join(self.cache_dir, f'{previous_id}.png'))
+            except FileNotFoundError:
+                pass
+
+assets = AssetStore()
@@ -0,0 +1,129 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+import hashlib
+import os
+import threading
+
+
+def image_bytes(img) -> int:
+    """
+    Memory taken by the pixels of a decoded PIL image, to weigh caches of images
+    """
+    return img.width * img.height * len(img.getbands())
+
+
+@lru_cache(maxsize=None)
+def code_version(*paths: str) -> str:
+    """
+    Hash of the source files `paths`, computed once per process
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = 'wb', **kwargs):
+    """
+    File writing to a temporary file next to `path`, moved over `path` once
+    complete so other threads and processes never read a partial file
+
+        with atomic_write('state.json', 'w') as f:
+            json.dump(state, f)
+    """
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        with open(tmp_path, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class LRUCache:
+    """
+    Thread-safe mapping that keeps at most `maxsize` entries, evicting the
+    least recently used one first. When a `weigher` is given, entries are also
+    evicted until their total weight (e.g. bytes) is under `max_weight`.
+    Hits and misses are counted so callers can report how effective the cache is.
+    """
+    def __init__(self, maxsize: int = 128, max_weight: int = None, weigher=None):
+        self.maxsize = maxsize
+        self.max_weight = max_weight
+        self.weight = 0
+        self.hits = 0
+        self.misses = 0
+        self._weigher = weigher
+        self._weights = {}
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = value
+            if self._weigher:
+                self._weights[key] = self._weigher(value)
+                self.weight += self._weights[key]
+            self._evict()
+        return value
+
+    def get_or_create(self, key, factory):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return self.put(key, factory())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._weights.clear()
+            self.weight = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'weight': self.weight,
+            'max_weight': self.max_weight,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def _discard(self, key):
+        del self._entries[key]
+        self.weight -= self._weights.pop(key, 0)
+
+    def _evict(self):
+        while self._entries and (
+            (self.maxsize is not None and len(self._entries) > self.maxsize) or
+            (self.max_weight is not None and self.weight > self.max_weight)
+        ):
+            self._discard(next(iter(self._entries)))
@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from datetime import datetime
 import pandas
 from helpers.reader import Reader
+from helpers.timing import timed
 from data import circuits as CIRCUITS
 
 @dataclass
@@ -17,6 +18,7 @@ class CalendarReader(Reader):
         super().__init__(type, filepath, None, out_filepath)
         self.season = season
 
+    @timed('read')
     def read(self):
         races = self._get_races_details()
             
@@ -29,21 +31,24 @@ class CalendarReader(Reader):
         return config
 
     def _get_races_details(self):
-        spreadsheet = self._get_google_spreadsheet()
-        sheet_names = self._get_sheet_names_from_gsheet(spreadsheet)
+        sheet_names = self._get_sheet_names_from_gsheet()
+
+        race_sheet_names = [sheet_name for sheet_name in sheet_names if sheet_name[:4] == 'Race']
+        races_vals = self._batch_get_from_gsheet({
+            sheet_name: f"'{sheet_name}'!A1:B22" for sheet_name in race_sheet_names
+        })
 
         races = []
-        for sheet_name in sheet_names:
-            if sheet_name[:4] == 'Race':
-                race_vals = spreadsheet.values().get(spreadsheetId=self.spreadsheet_id, range=f"'{sheet_name}'!A1:B22").execute()['values']
-                df = pandas.DataFrame(race_vals[1:], columns=['A','B'])
-                race = {
-                    'index': df['B'][0],
-                    'circuit': CIRCUITS.get(df['B'][1], None),
-                    'type': df['B'][20],
-                    'date': datetime.strptime(f"{df['B'][3]}/{datetime.now().year}", '%d/%m/%Y').date(),
-                    'hour': df['B'][4]
-                }
-                races.append(race)
+        for sheet_name in race_sheet_names:
+            race_vals = races_vals[sheet_name]
+            df = pandas.DataFrame(race_vals[1:], columns=['A','B'])
+            race = {
+                'index': df['B'][0],
+                'circuit': CIRCUITS.get(df['B'][1], None),
+                'type': df['B'][20],
+                'date': datetime.strptime(f"{df['B'][3]}/{datetime.now().year}", '%d/%m/%Y').date(),
+                'hour': df['B'][4]
+            }
+            races.append(race)
 
         return races
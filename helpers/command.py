@@ -1,4 +1,26 @@
 import argparse
+from helpers.fake_sheets import use_fake_sheets
+from helpers.sheet_cache import snapshots
+
+
+def add_sheets_arguments(parser: argparse.ArgumentParser):
+    """
+    Options of the commands reading google sheets, applied by `setup_sheets`
+    """
+    parser.add_argument("-n", "--no-cache", help="Always download the google sheet and render the visuals instead of using local caches", dest='no_cache', action='store_true')
+    parser.add_argument("-F", "--fake-sheets", help="Read google sheets from the JSON fixtures of this directory (see record_sheets.py) instead of Google", dest='fake_sheets', default=None)
+    parser.add_argument("-L", "--latency", help="Delay in milliseconds added to each request to the fake google sheets", dest='latency', type=float, default=0)
+
+
+def setup_sheets(args: argparse.Namespace):
+    """
+    Read google sheets as asked by the options of `add_sheets_arguments`
+    """
+    if args.fake_sheets:
+        use_fake_sheets(args.fake_sheets, args.latency / 1000)
+    if args.no_cache:
+        snapshots.ttl = 0
+        snapshots.check_revision = False
 
 
 class Command(argparse.ArgumentParser):
@@ -10,4 +32,6 @@ class Command(argparse.ArgumentParser):
         self.add_argument("-i", "--input", help="Input file to use (use 'gsheet:TIMESHEET_ID' for google sheet (replace TIMESHEET_ID with the id of the sheet of course)", dest='input', default='gsheet')
         self.add_argument("-a", "--season", help="Season (only used in standings)", dest='season', default=5)
         self.add_argument("-m", "--metric", help="Metric to use to sort rankings (only used in standings)", dest='metric', default='Total')
+        add_sheets_arguments(self)
+        self.add_argument("-T", "--trace", help="Write the timings of the run in this file (Chrome trace format, open it in chrome://tracing or ui.perfetto.dev)", dest='trace', default=None)
 
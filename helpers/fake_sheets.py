@@ -0,0 +1,144 @@
+import json
+import logging
+import os
+import re
+import time
+from helpers.sheet_cache import trim_rows
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_FIXTURES_DIR = 'fixtures/sheets'
+A1_RANGE = re.compile(r"^(?:'?(?P<sheet>.*?)'?!)?(?P<start_col>[A-Z]+)(?P<start_row>\d+)(?::(?P<end_col>[A-Z]+)(?P<end_row>\d+))?$")
+
+
+def _column_index(column: str) -> int:
+    index = 0
+    for char in column:
+        index = index * 26 + ord(char) - ord('A') + 1
+    return index - 1
+
+
+class _Request:
+    def __init__(self, fake, response: dict):
+        self.fake = fake
+        self.response = response
+
+    def execute(self) -> dict:
+        self.fake.calls += 1
+        if self.fake.latency:
+            time.sleep(self.fake.latency)
+        return self.response
+
+
+class FakeSpreadsheets:
+    """
+    Stand-in for the `spreadsheets()` resource of the Sheets API, serving the
+    sheets of `<fixtures_dir>/<spreadsheet id>.json` (see `record_fixture`)
+    with `latency` seconds of delay per request. Supports `get` (sheet titles),
+    `values().get` and `values().batchGet` over A1 ranges.
+    """
+    def __init__(self, fixtures_dir: str = DEFAULT_FIXTURES_DIR, latency: float = 0.0):
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.calls = 0
+        self._fixtures = {}
+
+    def get(self, spreadsheetId: str, fields: str = None, **kwargs) -> _Request:
+        sheets = self._load(spreadsheetId)['sheets']
+        return _Request(self, {'sheets': [{'properties': {'title': title}} for title in sheets]})
+
+    def values(self):
+        return _FakeValues(self)
+
+    def modified_time(self, spreadsheet_id: str) -> str:
+        return self._load(spreadsheet_id).get('modifiedTime') or time.strftime(
+            '%Y-%m-%dT%H:%M:%S.000Z', time.gmtime(os.path.getmtime(self._path(spreadsheet_id))))
+
+    def get_range(self, spreadsheet_id: str, range_str: str) -> dict:
+        match = A1_RANGE.match(range_str)
+        if not match:
+            raise ValueError(f'Unable to parse range "{range_str}"')
+        sheets = self._load(spreadsheet_id)['sheets']
+        if match['sheet'] not in sheets:
+            raise ValueError(f'Unable to parse range: {range_str}')
+        rows = sheets[match['sheet']]
+        start_row, start_col = int(match['start_row']) - 1, _column_index(match['start_col'])
+        end_row = int(match['end_row']) if match['end_row'] else start_row + 1
+        end_col = _column_index(match['end_col']) + 1 if match['end_col'] else start_col + 1
+        values = trim_rows([row[start_col:end_col] for row in rows[start_row:end_row]])
+        response = {'range': range_str, 'majorDimension': 'ROWS'}
+        if values:
+            response['values'] = values
+        return response
+
+    def _path(self, spreadsheet_id: str) -> str:
+        return os.path.join(self.fixtures_dir, f'{spreadsheet_id}.json')
+
+    def _load(self, spreadsheet_id: str) -> dict:
+        path = self._path(spreadsheet_id)
+        key = (path, os.stat(path).st_mtime_ns)
+        if key not in self._fixtures:
+            with open(path) as f:
+                self._fixtures[key] = json.load(f)
+        return self._fixtures[key]
+
+
+class _FakeValues:
+    def __init__(self, fake: FakeSpreadsheets):
+        self.fake = fake
+
+    def get(self, spreadsheetId: str, range: str, **kwargs) -> _Request:
+        return _Request(self.fake, self.fake.get_range(spreadsheetId, range))
+
+    def batchGet(self, spreadsheetId: str, ranges: list, **kwargs) -> _Request:
+        return _Request(self.fake, {
+            'spreadsheetId': spreadsheetId,
+            'valueRanges': [self.fake.get_range(spreadsheetId, range_str) for range_str in ranges]
+        })
+
+
+class FakeDrive:
+    """
+    Stand-in for the Drive API, only `files().get(fileId, fields='modifiedTime')`
+    """
+    def __init__(self, spreadsheets: FakeSpreadsheets):
+        self.spreadsheets = spreadsheets
+
+    def files(self):
+        return self
+
+    def get(self, fileId: str, fields: str = None, **kwargs) -> _Request:
+        return _Request(self.spreadsheets, {'modifiedTime': self.spreadsheets.modified_time(fileId)})
+
+
+def use_fake_sheets(fixtures_dir: str = DEFAULT_FIXTURES_DIR, latency: float = 0.0) -> FakeSpreadsheets:
+    """
+    Make every Reader of this process read the fixtures of `fixtures_dir`
+    instead of Google Sheets
+    """
+    from helpers.reader import Reader
+    fake = FakeSpreadsheets(fixtures_dir, latency)
+    Reader._spreadsheet = fake
+    Reader._drive = FakeDrive(fake)
+    _logger.info(f'Reading sheets from fixtures in "{os.path.realpath(fixtures_dir)}" ({latency * 1000:.0f}ms latency)')
+    return fake
+
+
+def record_fixture(spreadsheet, spreadsheet_id: str, fixtures_dir: str = DEFAULT_FIXTURES_DIR) -> str:
+    """
+    Save every sheet of `spreadsheet_id`, read through the real `spreadsheet`
+    resource, as a fixture of FakeSpreadsheets
+    """
+    res = spreadsheet.get(spreadsheetId=spreadsheet_id, fields='sheets.properties.title').execute()
+    titles = [sheet['properties']['title'] for sheet in res['sheets']]
+    ranges = [f"'{title}'" for title in titles]
+    value_ranges = spreadsheet.values().batchGet(spreadsheetId=spreadsheet_id, ranges=ranges).execute()['valueRanges']
+    fixture = {
+        'modifiedTime': None,
+        'sheets': {title: value_range.get('values', []) for title, value_range in zip(titles, value_ranges)}
+    }
+    os.makedirs(fixtures_dir, exist_ok=True)
+    path = os.path.join(fixtures_dir, f'{spreadsheet_id}.json')
+    with open(path, 'w') as f:
+        json.dump(fixture, f, ensure_ascii=False, indent=1)
+    return path
@@ -2,6 +2,7 @@ import pandas
 from helpers.generator_config import GeneratorType
 from helpers.generator_config import GeneratorConfig
 from helpers.reader import Reader
+from helpers.timing import timed
 
 class GeneralRankingReader(Reader):
 
@@ -14,16 +15,15 @@ class GeneralRankingReader(Reader):
         if type == GeneratorType.TeamsRanking.value:
             self.sheet_name = 'Teams Ranking'
 
+    @timed('read')
     def read(self):
         pilots, teams = self._read()
         ranking = self._get_general_ranking()
-        max_size = -1
         self.data = self.data.where(self.data != 'abs', pandas.NA)
         if self.type == GeneratorType.TeamsRanking.value:
             self.data = self.data.where(self.data != '0', pandas.NA)
-        for i, row in self.data.iterrows():
-            r = row.dropna()
-            max_size = max_size if max_size > r.size else r.size
+        # number of filled cells of the most complete row
+        max_size = self.data.notna().sum(axis=1).max()
         if self.type == GeneratorType.PilotsRanking.value:
             if self.metric == 'Total':
                 ranking_title = f'season {self.season} pilots standings'.upper()
@@ -45,10 +45,11 @@ class GeneralRankingReader(Reader):
         )
         return config
 
-    def _get_data_sheet_from_gsheet(self, spreadsheet):
-        range_str = f"'{self.sheet_name}'!A1:S50"
-        vals = spreadsheet.values().get(spreadsheetId=self.spreadsheet_id, range=range_str).execute()['values']
-        columns = vals[0] 
+    def _get_data_range(self, sheet_name: str) -> str:
+        return f"'{sheet_name}'!A1:S50"
+
+    def _build_data_sheet(self, vals: list) -> pandas.DataFrame:
+        columns = vals[0]
         values = [
             row + ([None] * (len(columns) - len(row)))
             for row in vals[1:]
@@ -1,9 +1,12 @@
 from dataclasses import dataclass
 import enum
-import pandas
+from typing import TYPE_CHECKING
 
 from models import Pilot, Race
 
+if TYPE_CHECKING:
+    import pandas
+
 class GeneratorType(enum.Enum):
     Presentation = 'presentation'
     Lineup ='lineup'
@@ -28,7 +31,7 @@ class GeneratorConfig:
     race: Race = None
     description: str = None
     qualif_ranking: list = None
-    ranking: pandas.DataFrame = None
+    ranking: 'pandas.DataFrame' = None
     fastest_lap: FastestLap = None
     ranking_title: str = None
     ranking_subtitle: str = None
@@ -4,6 +4,9 @@ import logging
 import os.path
 import pandas
 from helpers.generator_config import FastestLap, GeneratorConfig
+from helpers.sheet_cache import snapshots
+from helpers.timing import span, timed
+from helpers.xlsx_workbook import XlsxWorkbook
 from models import Pilot, Race
 from data import circuits, teams_idx
 from data import (
@@ -16,6 +19,9 @@ from data import (
 
 _logger = logging.getLogger(__name__)
 
+# visuals rendered from a race sheet
+RACE_TYPES = ('lineup', 'presentation', 'results', 'details', 'fastest', 'pole')
+
 @dataclass
 class InputData:
     sheet_names: list
@@ -24,7 +30,12 @@ class InputData:
 
 class Reader:
     VALUES_SHEET_NAME = '_values'
+    VALUES_RANGE = '_values!A1:G30'
+    SHEET_NAMES_KEY = '#sheet_names'
     DEFAULT_SPREADSHEET_ID = '1JJw3YnVUXYCyjhH4J5MIbVg5OtjTIDLptx0pF2M9KV4'
+    # authenticated spreadsheets and drive resources, built once per process
+    _spreadsheet = None
+    _drive = None
 
     def __init__(self, type: str, filepath: str = './data.xlsx', sheet_name: str = None, out_filepath: str = None):
         self.filepath = filepath
@@ -36,50 +47,66 @@ class Reader:
         self.sheet_name = sheet_name
         self.type = type
         self.out_filepath = out_filepath
+        self.types = [type]
+        self._revision = None
 
     def read(self):
-        pilots, teams = self._read()
-        race = self._get_race(pilots, teams) if self.type not in ('numbers', 'season_lineup') else None
+        return self.read_all([self.type])[self.type]
+
+    def read_all(self, types: list) -> dict:
+        """
+        Configs of every visual type of `types` for the same sheet, which is
+        read only once and whose pilots, teams and race are shared
+        """
+        self.types = types
+        with span('read', types=','.join(types)):
+            pilots, teams = self._read()
+            with span('read.build'):
+                race = None
+                if any(type not in ('numbers', 'season_lineup') for type in types):
+                    race = self._get_race(pilots, teams)
+                return {type: self._build_config(type, pilots, teams, race) for type in types}
+
+    def _build_config(self, type: str, pilots: dict, teams: list, race: Race) -> GeneratorConfig:
         config = GeneratorConfig(
-            type=self.type,
-            output=self.out_filepath or f'./output/{self.type}.png',
+            type=type,
+            output=self.out_filepath or f'./output/{type}.png',
             pilots=pilots,
             teams=teams,
-            race=race
+            race=race if type not in ('numbers', 'season_lineup') else None
         )
-        if self.type == 'presentation':
+        if type == 'presentation':
             config.description = self.data['A'][6]
-        if self.type in ('pole', 'grid'):
+        if type in ('pole', 'grid'):
             config.qualif_ranking = [
                 race.get_pilot(self.data['G'][29]),
                 race.get_pilot(self.data['G'][30]),
                 race.get_pilot(self.data['G'][31]),
             ]
-        if self.type in ('results', 'details', 'fastest', 'grid'):
-            config.ranking = self._get_ranking()
-        if self.type in ('results', 'details'):
-            config.fastest_lap = self._get_fastest_lap(race)
+        if type in ('results', 'details', 'fastest', 'grid'):
+            config.ranking = self._get_ranking(type)
+        if type in ('results', 'details'):
+            config.fastest_lap = self._get_fastest_lap(type, race)
         return config
 
     def _determine_swappings(self, pilots):
         replacements = self.data[['D', 'E']].where(lambda x: x != '', pandas.NA).dropna()
         out = {}
-        for _, row in replacements.iterrows():
-            subs = row['E']
+        for pilot_name, subs in replacements.itertuples(index=False):
             while out.get(subs) and len(subs) < 22:
                 subs += ' '
-            out[subs] = pilots.get(row['D'])
+            out[subs] = pilots.get(pilot_name)
         return out
 
     def _build_pilots_list(self, values: pandas.DataFrame):
         return {
-            row['Pilotes']: Pilot(name=row['Pilotes'], team=teams_idx.get(row['Ecurie'], RESERVIST_TEAM if row['Ecurie'] == 'R' else DEFAULT_TEAM), number=row['Numéro'])
-            for _, row in values[values['Pilotes'].notnull()].iterrows()
+            name: Pilot(name=name, team=teams_idx.get(team, RESERVIST_TEAM if team == 'R' else DEFAULT_TEAM), number=number)
+            for name, number, team in values[values['Pilotes'].notnull()][['Pilotes', 'Numéro', 'Ecurie']].itertuples(index=False)
         }
 
     def _build_teams_list(self, values: pandas.DataFrame):
         return [
-            teams_idx[row['Ecuries']] for _, row in values.dropna().iterrows()
+            teams_idx[team_name] for team_name in values['Ecuries'].dropna()
         ]
 
     def _read(self):
@@ -88,7 +115,8 @@ class Reader:
         else:
             input_data = self._get_data_from_xlsx()
 
-        pilots, teams = self._determine_pilots_and_teams(input_data.sheet_values)
+        with span('read.build'):
+            pilots, teams = self._determine_pilots_and_teams(input_data.sheet_values)
         self.data = input_data.sheet_data
         return pilots, teams
 
@@ -124,15 +152,15 @@ class Reader:
             swappings=self._determine_swappings(pilots)
         )
 
-    def _get_ranking(self):
+    def _get_ranking(self, type: str):
         ranking_cols = ['I', 'J', 'K', 'L']
-        if self.type == 'results':
+        if type == 'results':
             ranking_cols = 'I'
         return self.data[ranking_cols][:20]
 
-    def _get_fastest_lap(self, race:Race):
+    def _get_fastest_lap(self, type: str, race:Race):
         vals = {'pilot_name': self.data['G'][22]}
-        if self.type == 'details':
+        if type == 'details':
             vals.update({
                 'lap': self.data['G'][24],
                 'time': self.data['G'][26]}
@@ -144,76 +172,125 @@ class Reader:
             time=vals.get('time')
         )
 
-    def _get_sheet_names_from_gsheet(self, spreadsheet):
-        res = spreadsheet.get(spreadsheetId=self.spreadsheet_id).execute()
-        return [s['properties']['title'] for s in res['sheets']]
+    def _get_sheet_names_from_gsheet(self):
+        sheet_names = snapshots.get(self.spreadsheet_id, self.SHEET_NAMES_KEY, self._get_revision)
+        if sheet_names is None:
+            revision = self._get_revision() if snapshots.check_revision else None
+            with span('sheets.get'):
+                res = self._get_google_spreadsheet().get(spreadsheetId=self.spreadsheet_id, fields='sheets.properties.title').execute()
+            sheet_names = [s['properties']['title'] for s in res['sheets']]
+            snapshots.put(self.spreadsheet_id, {self.SHEET_NAMES_KEY: sheet_names}, revision)
+        return sheet_names
 
-    def _get_values_sheet_from_gsheet(self, spreadsheet):
-        sheet_names = self._get_sheet_names_from_gsheet(spreadsheet)
+    def _batch_get_from_gsheet(self, ranges: dict) -> dict:
+        """
+        Rows of every range of `ranges` ({key: A1 range}) as {key: rows}, the
+        ones missing from the local snapshot are fetched in a single request
+        """
+        rows = {}
+        for key, range_str in ranges.items():
+            values = snapshots.get(self.spreadsheet_id, range_str, self._get_revision)
+            if values is not None:
+                rows[key] = values
 
-        if self.VALUES_SHEET_NAME in sheet_names:
-            vals = spreadsheet.values().get(spreadsheetId=self.spreadsheet_id, range='_values!A1:G30').execute()
-            sheet_values = pandas.DataFrame(vals['values'][1:], columns=vals['values'][0])
-        else:
-            sheet_values = None
-        return sheet_values
+        missing = {key: range_str for key, range_str in ranges.items() if key not in rows}
+        if missing:
+            revision = self._get_revision() if snapshots.check_revision else None
+            with span('sheets.batch_get'):
+                res = self._get_google_spreadsheet().values().batchGet(spreadsheetId=self.spreadsheet_id, ranges=list(missing.values())).execute()
+            fetched = {
+                range_str: value_range.get('values', [])
+                for range_str, value_range in zip(missing.values(), res['valueRanges'])
+            }
+            snapshots.put(self.spreadsheet_id, fetched, revision)
+            rows.update({key: fetched[range_str] for key, range_str in missing.items()})
+        return rows
+
+    def _build_values_sheet(self, vals: list) -> pandas.DataFrame:
+        return pandas.DataFrame(vals[1:], columns=vals[0])
 
-    def _get_data_sheet_from_gsheet(self, spreadsheet):
-        race_vals = spreadsheet.values().get(spreadsheetId=self.spreadsheet_id, range=f"'{self.sheet_name}'!A1:L33").execute()['values']
+    def _get_data_range(self, sheet_name: str) -> str:
+        return f"'{sheet_name}'!A1:L33"
+
+    def _build_data_sheet(self, race_vals: list) -> pandas.DataFrame:
         max_len = max([len(race_val) for race_val in race_vals[1:]])
         columns = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L'][:max_len]
         return pandas.DataFrame(race_vals[1:], columns=columns)
 
     def _get_data_from_gsheet(self) -> InputData:
-        spreadsheet = self._get_google_spreadsheet()
-        sheet_names = self._get_sheet_names_from_gsheet(spreadsheet)
-        sheet_values = self._get_values_sheet_from_gsheet(spreadsheet)
+        sheet_names = self._get_sheet_names_from_gsheet()
+        if self.sheet_name and self.sheet_name not in sheet_names:
+            raise Exception(f'{self.sheet_name} is not a valid sheet name, please select a sheet within possible values : {sheet_names}')
 
-        if not self.sheet_name:
-            sheet_data = None
-        else:
+        vals = self._batch_get_from_gsheet(self._get_input_ranges(sheet_names))
+        _logger.info(f'Data have been read from google spreadsheet "{self.spreadsheet_id}"')
+        return self._build_input_data(sheet_names, vals)
+
+    @timed('read.xlsx')
+    def _get_data_from_xlsx(self) -> InputData:
+        with XlsxWorkbook(self.filepath) as workbook:
+            sheet_names = workbook.sheet_names
             if self.sheet_name not in sheet_names:
-                raise Exception(f'{self.sheet_name} is not a valid sheet name, please select a sheet within possible values : {sheet_names}')
-            sheet_data = self._get_data_sheet_from_gsheet(spreadsheet)
+                raise Exception(f'Please select a sheet within possible values : {sheet_names}')
+            vals = workbook.get_ranges(self._get_input_ranges(sheet_names))
+        _logger.info(f'Data have been read from file "{os.path.realpath(self.filepath)}"')
+        return self._build_input_data(sheet_names, vals)
 
-        _logger.info(f'Data have been read from google spreadsheet "{self.spreadsheet_id}"')
+    def _get_input_ranges(self, sheet_names: list) -> dict:
+        ranges = {}
+        if self.VALUES_SHEET_NAME in sheet_names:
+            ranges['values'] = self.VALUES_RANGE
+        if self.sheet_name:
+            ranges['data'] = self._get_data_range(self.sheet_name)
+        return ranges
+
+    def _build_input_data(self, sheet_names: list, vals: dict) -> InputData:
         return InputData(
             sheet_names=sheet_names,
-            sheet_values=sheet_values,
-            sheet_data=sheet_data
+            sheet_values=self._build_values_sheet(vals['values']) if 'values' in vals else None,
+            sheet_data=self._build_data_sheet(vals['data']) if 'data' in vals else None
         )
 
-    def _get_data_from_xlsx(self) -> InputData:
-        sheet_values = None
-        with pandas.ExcelFile(self.filepath) as xls:
-            if self.VALUES_SHEET_NAME in xls.sheet_names:
-                sheet_values = pandas.read_excel(xls, self.VALUES_SHEET_NAME)[['Pilotes', 'Numéro', 'Ecurie', 'Ecuries']]
-
-            if self.sheet_name not in xls.sheet_names:
-                raise Exception(f'Please select a sheet within possible values : {xls.sheet_names}')
-            names = self._get_sheet_columns()
-            sheet_data = pandas.read_excel(xls, self.sheet_name, usecols=names, names=names)
-            _logger.info(f'Data have been read from file "{os.path.realpath(self.filepath)}"')
-            return InputData(
-                sheet_names=xls.sheet_names,
-                sheet_values=sheet_values,
-                sheet_data=sheet_data
-            )
+    def _get_google_spreadsheet(self):
+        if Reader._spreadsheet is None:
+            Reader._spreadsheet = self._build_google_spreadsheet()
+        return Reader._spreadsheet
 
-    def _get_sheet_columns(self) -> list:
-        if self.type in ('details', 'fastest'):
-            return ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J', 'K', 'L']
-        if self.type == 'results':
-            return ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I']
-        return ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']
+    def _get_revision(self) -> str:
+        """
+        Drive modifiedTime of the spreadsheet, fetched at most once per read
+        """
+        if self._revision is None:
+            from googleapiclient.discovery import build
+            from googleapiclient.errors import HttpError
+            try:
+                if Reader._drive is None:
+                    Reader._drive = build('drive', 'v3', credentials=self._get_google_credentials())
+                with span('drive.revision'):
+                    res = Reader._drive.files().get(fileId=self.spreadsheet_id, fields='modifiedTime').execute()
+                self._revision = res['modifiedTime']
+            except HttpError as err:
+                _logger.warning(f'Unable to read the revision of "{self.spreadsheet_id}", relying on the snapshot TTL ({err})')
+                self._revision = ''
+        return self._revision
 
-    def _get_google_spreadsheet(self):
+    @timed('sheets.auth')
+    def _build_google_spreadsheet(self):
+        from googleapiclient.discovery import build
+        from googleapiclient.errors import HttpError
+        try:
+            service = build('sheets', 'v4', credentials=self._get_google_credentials())
+            return service.spreadsheets()
+        except HttpError as err:
+            print(err)
+
+    def _get_google_credentials(self):
         from google.auth.transport.requests import Request
         from google.oauth2.credentials import Credentials
         from google_auth_oauthlib.flow import InstalledAppFlow
-        from googleapiclient.discovery import build
-        from googleapiclient.errors import HttpError
         scopes = ['https://www.googleapis.com/auth/spreadsheets.readonly']
+        if snapshots.check_revision:
+            scopes.append('https://www.googleapis.com/auth/drive.metadata.readonly')
         creds = None
         if os.path.exists('token.json'):
             creds = Credentials.from_authorized_user_file('token.json', scopes)
@@ -225,9 +302,4 @@ class Reader:
                 creds = flow.run_local_server(port=0)
             with open('token.json', 'w') as token:
                 token.write(creds.to_json())
-
-        try:
-            service = build('sheets', 'v4', credentials=creds)
-            return service.spreadsheets()
-        except HttpError as err:
-            print(err)
\ No newline at end of file
+        return creds
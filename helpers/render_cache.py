@@ -0,0 +1,156 @@
+import dataclasses
+import datetime
+import enum
+import hashlib
+import importlib
+import json
+import logging
+import os
+import sys
+from helpers.cache import atomic_write, code_version
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_CACHE_DIR = '.cache/renders'
+ASSETS_DIR = 'assets'
+# modules every visual depends on, on top of its own generator
+CODE_MODULES = ('generators.abstract_generator', 'models', 'data', 'font_factory', 'helpers.transform', 'helpers.assets')
+# config fields that do not change the rendered image
+IGNORED_FIELDS = ('output',)
+
+
+def canonical(obj):
+    """
+    JSON-serializable form of a config, stable across processes: dataclass
+    fields by name (private and ignored ones skipped), dicts sorted by key,
+    frames in their "split" JSON form
+    """
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {
+            '__type__': type(obj).__name__,
+            **{
+                field.name: canonical(getattr(obj, field.name))
+                for field in dataclasses.fields(obj)
+                if not field.name.startswith('_') and field.name not in IGNORED_FIELDS
+            }
+        }
+    # no need to import pandas if it was not to build the config
+    pandas = sys.modules.get('pandas')
+    if pandas and isinstance(obj, (pandas.DataFrame, pandas.Series)):
+        return obj.to_json(orient='split', date_format='iso')
+    if isinstance(obj, dict):
+        return {str(key): canonical(value) for key, value in sorted(obj.items(), key=lambda item: str(item[0]))}
+    if isinstance(obj, (list, tuple)):
+        return [canonical(value) for value in obj]
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    if obj is None or isinstance(obj, (str, int, float, bool)):
+        return obj
+    return repr(obj)
+
+
+class RenderCache:
+    """
+    Encoded visuals keyed by the hash of their config, of the generator code
+    and of the assets (paths, mtimes and sizes). Files are kept in `cache_dir`
+    and the least recently used ones are removed once they take more than
+    `max_bytes`. Set `cache_dir` to None to disable the cache.
+    """
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, config, generator_cls, image_format: str) -> str:
+        content = json.dumps({
+            'config': canonical(config),
+            'code': self._code_version(generator_cls),
+            'assets': self._assets_fingerprint(),
+            'format': image_format.upper(),
+        }, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def get(self, key: str) -> bytes:
+        if not self.cache_dir:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        os.utime(path)
+        self.hits += 1
+        _logger.info(f'Render cache hit ({key[:12]})')
+        return content
+
+    def put(self, key: str, content: bytes):
+        if not self.cache_dir:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        with atomic_write(path) as f:
+            f.write(content)
+        self._evict()
+
+    def clear(self):
+        for entry in self._entries():
+            os.remove(entry.path)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        entries = self._entries()
+        return {
+            'files': len(entries),
+            'bytes': sum(entry.stat().st_size for entry in entries),
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.bin')
+
+    def _entries(self) -> list:
+        if not self.cache_dir or not os.path.isdir(self.cache_dir):
+            return []
+        return [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith('.bin')]
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime_ns)
+        total = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            total -= entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+    def _code_version(self, generator_cls) -> str:
+        """
+        Hash of the source of `generator_cls`'s module and of CODE_MODULES
+        """
+        return code_version(*(
+            importlib.import_module(module_name).__file__
+            for module_name in (generator_cls.__module__,) + CODE_MODULES
+        ))
+
+    def _assets_fingerprint(self) -> list:
+        fingerprint = []
+        for root, dirs, files in os.walk(ASSETS_DIR):
+            dirs.sort()
+            for filename in sorted(files):
+                stat = os.stat(os.path.join(root, filename))
+                fingerprint.append((os.path.join(root, filename), stat.st_mtime_ns, stat.st_size))
+        return fingerprint
+
+
+renders = RenderCache()
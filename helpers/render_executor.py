@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 2
+DEFAULT_TIMEOUT = 120
+
+
+def _warm_worker():
+    """
+    Pool initializer, loads every generator's fonts and sprites and the
+    recorded asset variants once so that the first job of each worker is as
+    fast as the next
+    """
+    from breaking import Renderer as BreakingRenderer
+    from helpers.assets import assets
+    from helpers.renderer import Renderer
+
+    assets.preload()
+    for type in Renderer.generators:
+        generator = Renderer.get_generator(type)
+        generator.preload()
+        generator.build_sprites()
+    BreakingRenderer.preload()
+    _logger.info(f'Render worker {os.getpid()} ready')
+
+
+def _ping():
+    return os.getpid()
+
+
+def render_race(what: str, sheet_name: str, image_format: str = 'PNG') -> bytes:
+    from helpers.reader import Reader
+    from helpers.renderer import Renderer
+
+    config = Reader(what, 'gsheet', sheet_name).read()
+    return Renderer.render(config, image_format).getvalue()
+
+
+def render_ranking(what: str, metric: str, season: int = 5, image_format: str = 'PNG') -> bytes:
+    from helpers.general_ranking_reader import GeneralRankingReader
+    from helpers.renderer import Renderer
+
+    config = GeneralRankingReader(f'{what}_ranking', 'gsheet', None, season, metric).read()
+    return Renderer.render(config, image_format).getvalue()
+
+
+def render_breaking(main_txt: str, secondary_txt: str, team: str, background: str, foreground: str,
+                    input: bytes, padding_top: int = None, image_format: str = 'PNG') -> bytes:
+    from breaking import Renderer as BreakingRenderer
+
+    renderer = BreakingRenderer(main_txt, secondary_txt, team, background, foreground,
+                                output=None, input=BytesIO(input), padding_top=padding_top)
+    return renderer.render(image_format).getvalue()
+
+
+class RenderExecutor:
+    """
+    Runs render jobs (top-level functions of this module, or any picklable
+    callable) in a pool of warm worker processes so the event loop is never
+    blocked by a render.
+
+    `submit` is awaitable and raises `asyncio.TimeoutError` when the job takes
+    longer than its timeout. A job that timed out while still queued is
+    dropped; one already running cannot be interrupted and finishes in its
+    worker, its result being discarded.
+    """
+    def __init__(self, max_workers: int = DEFAULT_WORKERS, timeout: float = DEFAULT_TIMEOUT):
+        self.max_workers = max_workers or DEFAULT_WORKERS
+        self.timeout = timeout
+        self.pending = 0
+        self.max_pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self._pool = ProcessPoolExecutor(self.max_workers, initializer=_warm_worker)
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Jobs submitted but not yet picked up by a worker
+        """
+        return max(0, self.pending - self.max_workers)
+
+    async def submit(self, fn, *args, timeout: float = None):
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._pool, fn, *args)
+        self.pending += 1
+        self.max_pending = max(self.max_pending, self.pending)
+        _logger.info(f'Submitted {fn.__name__} (queue depth: {self.queue_depth})')
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(future, timeout or self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            _logger.warning(f'{fn.__name__} timed out after {time.perf_counter() - start:.1f}s')
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.pending -= 1
+        self.completed += 1
+        _logger.info(f'{fn.__name__} done in {time.perf_counter() - start:.2f}s')
+        return result
+
+    async def warm(self):
+        """
+        Start every worker now rather than on the first command (straight on
+        the pool, so that these pings are not counted in `stats`)
+        """
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._pool, _ping) for _ in range(self.max_workers)))
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            'workers': self.max_workers,
+            'pending': self.pending,
+            'queue_depth': self.queue_depth,
+            'max_pending': self.max_pending,
+            'completed': self.completed,
+            'failed': self.failed,
+            'timed_out': self.timed_out,
+        }
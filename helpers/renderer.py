@@ -1,37 +1,66 @@
+import importlib
+import os.path
+from io import BytesIO
+from PIL import Image
 from helpers.generator_config import GeneratorConfig
-
-from generators.pole_generator import PoleGenerator
-from generators.details_generator import DetailsGenerator
-from generators.fastest_generator import FastestGenerator
-from generators.results_generator import ResultsGenerator
-from generators.lineups_generator import LineupGenerator
-from generators.presentation_generator import PresentationGenerator
-from generators.teams_ranking_generator import TeamsRankingGenerator
-from generators.pilots_ranking_generator import PilotsRankingGenerator
-from generators.numbers_generator import NumbersGenerator
-from generators.calendar_generator import CalendarGenerator
-from generators.season_lineup_generator import SeasonLineupGenerator
+from helpers.render_cache import renders
+from helpers.timing import span
 
 
 class Renderer:
+    # generator classes by visual type, imported on first use
     generators = {
-        'lineup': LineupGenerator,
-        'presentation': PresentationGenerator,
-        'results': ResultsGenerator,
-        'details': DetailsGenerator,
-        'fastest': FastestGenerator,
-        'pole': PoleGenerator,
-        'teams_ranking': TeamsRankingGenerator,
-        'pilots_ranking': PilotsRankingGenerator,
-        'numbers': NumbersGenerator,
-        'season_lineup': SeasonLineupGenerator,
-        'calendar': CalendarGenerator
+        'lineup': 'generators.lineups_generator.LineupGenerator',
+        'presentation': 'generators.presentation_generator.PresentationGenerator',
+        'results': 'generators.results_generator.ResultsGenerator',
+        'details': 'generators.details_generator.DetailsGenerator',
+        'fastest': 'generators.fastest_generator.FastestGenerator',
+        'pole': 'generators.pole_generator.PoleGenerator',
+        'teams_ranking': 'generators.teams_ranking_generator.TeamsRankingGenerator',
+        'pilots_ranking': 'generators.pilots_ranking_generator.PilotsRankingGenerator',
+        'numbers': 'generators.numbers_generator.NumbersGenerator',
+        'season_lineup': 'generators.season_lineup_generator.SeasonLineupGenerator',
+        'calendar': 'generators.calendar_generator.CalendarGenerator'
     }
 
     @classmethod
-    def render(cls, config: GeneratorConfig):
-        if not config.type in cls.generators:
+    def get_generator(cls, type: str):
+        if not type in cls.generators:
             raise Exception(f'Please specify a valid visual type ({", ".join(cls.generators.keys())})')
+        module_name, class_name = cls.generators[type].rsplit('.', 1)
+        return getattr(importlib.import_module(module_name), class_name)
+
+    @classmethod
+    def render(cls, config: GeneratorConfig, image_format: str = None, use_cache: bool = True):
+        """
+        Render the visual into `config.output` and return its path or, when
+        `image_format` is given (e.g. 'PNG'), encode it in memory and return
+        the BytesIO instead.
+        Visuals already rendered from an identical config are served from the
+        render cache unless `use_cache` is False.
+        """
+        with span('render', type=config.type):
+            with span('import'):
+                generator_cls = cls.get_generator(config.type)
+            output_format = image_format or cls._get_file_format(config.output)
+            with span('render_cache'):
+                key = renders.key(config, generator_cls, output_format) if use_cache and renders.cache_dir else None
+                content = renders.get(key) if key else None
+            if content is None:
+                content = generator_cls(config).generate_buffer(output_format).getvalue()
+                if key:
+                    with span('render_cache'):
+                        renders.put(key, content)
+
+            if image_format:
+                return BytesIO(content)
+            with open(config.output, 'wb') as f:
+                f.write(content)
+            return config.output
 
-        generator = cls.generators[config.type](config)
-        return generator.generate()
+    @staticmethod
+    def _get_file_format(filepath: str) -> str:
+        ext = os.path.splitext(filepath)[1].lower()
+        if ext not in Image.registered_extensions():
+            raise ValueError(f'unknown file extension: {ext}')
+        return Image.registered_extensions()[ext]
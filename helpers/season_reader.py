@@ -0,0 +1,81 @@
+import logging
+import os.path
+from helpers.reader import Reader, RACE_TYPES
+from helpers.timing import timed
+from helpers.xlsx_workbook import XlsxWorkbook
+
+_logger = logging.getLogger(__name__)
+
+
+class SeasonReader(Reader):
+    """
+    Reads every `Race*` sheet of the season (plus `_values`) at once and
+    builds the configs of `types` for each of them
+    """
+    def __init__(self, filepath: str = './data.xlsx', out_dir: str = './output', types: list = RACE_TYPES):
+        super().__init__(types[0], filepath, None, None)
+        self.types = list(types)
+        self.out_dir = out_dir
+
+    @timed('read')
+    def read(self) -> dict:
+        """
+        {(sheet_name, type): config}, races whose sheet cannot be read yet
+        (e.g. not filled in) are skipped with a warning
+        """
+        if self.spreadsheet_id:
+            sheet_values, races_data = self._get_season_from_gsheet()
+        else:
+            sheet_values, races_data = self._get_season_from_xlsx()
+        pilots, teams = self._determine_pilots_and_teams(sheet_values)
+
+        configs = {}
+        for sheet_name, data in races_data.items():
+            self.data = data
+            try:
+                race = self._get_race(pilots, teams)
+            except Exception as e:
+                _logger.warning(f'Skipping "{sheet_name}", its race cannot be read ({e!r})')
+                continue
+            for type in self.types:
+                try:
+                    config = self._build_config(type, pilots, teams, race)
+                except Exception as e:
+                    _logger.warning(f'Skipping {type} of "{sheet_name}" ({e!r})')
+                    continue
+                config.output = os.path.join(self.out_dir, sheet_name.lower().replace(' ', '_'), f'{type}.png')
+                configs[(sheet_name, type)] = config
+        return configs
+
+    def _is_race_sheet(self, sheet_name: str) -> bool:
+        return sheet_name[:4] == 'Race'
+
+    def _get_season_from_gsheet(self):
+        sheet_names = self._get_sheet_names_from_gsheet()
+        vals = self._batch_get_from_gsheet(self._get_season_ranges(sheet_names))
+        return self._build_season(vals)
+
+    def _get_season_from_xlsx(self):
+        with XlsxWorkbook(self.filepath) as workbook:
+            vals = workbook.get_ranges(self._get_season_ranges(workbook.sheet_names))
+        _logger.info(f'Data have been read from file "{os.path.realpath(self.filepath)}"')
+        return self._build_season(vals)
+
+    def _get_season_ranges(self, sheet_names: list) -> dict:
+        ranges = {
+            sheet_name: self._get_data_range(sheet_name)
+            for sheet_name in sheet_names if self._is_race_sheet(sheet_name)
+        }
+        if self.VALUES_SHEET_NAME in sheet_names:
+            ranges[self.VALUES_SHEET_NAME] = self.VALUES_RANGE
+        return ranges
+
+    def _build_season(self, vals: dict):
+        sheet_values = self._build_values_sheet(vals.pop(self.VALUES_SHEET_NAME)) if self.VALUES_SHEET_NAME in vals else None
+        races_data = {}
+        for sheet_name, rows in vals.items():
+            try:
+                races_data[sheet_name] = self._build_data_sheet(rows)
+            except ValueError:
+                _logger.warning(f'Skipping "{sheet_name}", it is empty')
+        return sheet_values, races_data
@@ -0,0 +1,117 @@
+import gzip
+import json
+import logging
+import os
+import time
+from helpers.cache import atomic_write
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = '.cache/sheets'
+DEFAULT_TTL = 60
+
+
+def trim_rows(rows) -> list:
+    """
+    Drop trailing empty cells and rows, as the Sheets API does
+    """
+    rows = [list(row) for row in rows]
+    for row in rows:
+        while row and row[-1] in ('', None):
+            row.pop()
+    while rows and not rows[-1]:
+        rows.pop()
+    return rows
+
+
+class SheetSnapshotCache:
+    """
+    Local snapshots of the ranges fetched from Google Sheets, one gzipped JSON
+    file per spreadsheet holding the rows of each range.
+
+    A snapshot is served while it is younger than `ttl` seconds. Past that,
+    when `check_revision` is set, it is still served if the spreadsheet's Drive
+    `modifiedTime` did not change since it was taken (this needs the
+    `drive.metadata.readonly` scope in token.json). A `ttl` of 0 without
+    `check_revision` disables the cache.
+    """
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, ttl: float = DEFAULT_TTL, check_revision: bool = False):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.check_revision = check_revision
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.cache_dir) and (self.ttl > 0 or self.check_revision)
+
+    def get(self, spreadsheet_id: str, key: str, revision=None):
+        """
+        Cached rows of `key` or None, `revision` is a callable returning the
+        current modifiedTime, only called for snapshots older than `ttl`
+        """
+        if not self.enabled:
+            return None
+        entry = self._read(spreadsheet_id).get(key)
+        if entry and self._is_fresh(entry, revision):
+            self.hits += 1
+            _logger.info(f'Sheet snapshot hit for "{key}"')
+            return entry['values']
+        self.misses += 1
+        _logger.info(f'Sheet snapshot miss for "{key}"')
+        return None
+
+    def put(self, spreadsheet_id: str, values_by_key: dict, revision: str = None):
+        if not self.enabled or not values_by_key:
+            return
+        snapshot = self._read(spreadsheet_id)
+        fetched_at = time.time()
+        for key, values in values_by_key.items():
+            snapshot[key] = {'fetched_at': fetched_at, 'revision': revision, 'values': values}
+        self._write(spreadsheet_id, snapshot)
+
+    def clear(self, spreadsheet_id: str = None):
+        if not self.cache_dir or not os.path.isdir(self.cache_dir):
+            return
+        for filename in os.listdir(self.cache_dir):
+            if filename == f'{spreadsheet_id}.json.gz' or (spreadsheet_id is None and filename.endswith('.json.gz')):
+                os.remove(os.path.join(self.cache_dir, filename))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def _is_fresh(self, entry: dict, revision) -> bool:
+        if time.time() - entry['fetched_at'] < self.ttl:
+            return True
+        if self.check_revision and revision and entry['revision']:
+            return revision() == entry['revision']
+        return False
+
+    def _path(self, spreadsheet_id: str) -> str:
+        return os.path.join(self.cache_dir, f'{spreadsheet_id}.json.gz')
+
+    def _read(self, spreadsheet_id: str) -> dict:
+        path = self._path(spreadsheet_id)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            _logger.warning(f'Ignoring unreadable sheet snapshot "{path}"')
+            return {}
+
+    def _write(self, spreadsheet_id: str, snapshot: dict):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(spreadsheet_id)
+        with atomic_write(path) as raw, gzip.open(raw, 'wt', encoding='utf-8') as f:
+            json.dump(snapshot, f, separators=(',', ':'))
+
+
+snapshots = SheetSnapshotCache()
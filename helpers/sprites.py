@@ -0,0 +1,68 @@
+import hashlib
+import os
+from PIL import Image
+from helpers.cache import LRUCache, atomic_write, code_version, image_bytes
+from helpers.timing import span
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_CACHE_DIR = '.cache/sprites'
+# sources a persisted sprite is drawn with, besides the module of its factory
+CODE_FILES = ('helpers/transform.py', 'font_factory.py')
+
+
+class SpriteCache:
+    """
+    Process-wide cache of the pieces visuals are assembled from (e.g. a team
+    card with a pilot name drawn on it), so that rendering a visual whose data
+    barely changed since the last render is mostly pasting cached pieces.
+
+    A sprite is keyed by everything it is drawn from: `key` holds the data
+    and dimensions, and the modification times of the `assets` it uses are
+    added to it so editing one of them redraws its sprites. Sprites are
+    shared and must be treated as read-only.
+
+    Sprites requested with `persist` are also saved in `cache_dir` (by hash of
+    the repr of their key, which must then be stable, e.g. str, numbers and
+    tuples, and of the source of the module drawing them) so they survive
+    restarts and can be built ahead of time (see
+    `AbstractGenerator.build_sprites`).
+    """
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._sprites = LRUCache(maxsize=None, max_weight=max_bytes, weigher=image_bytes)
+
+    def get(self, key: tuple, factory, assets: tuple = (), persist: bool = False) -> Image.Image:
+        key = key + tuple((os.path.normpath(path), os.stat(path).st_mtime_ns) for path in assets)
+        return self._sprites.get_or_create(key, lambda: self._load(key, factory, persist))
+
+    def clear(self):
+        self._sprites.clear()
+
+    def stats(self) -> dict:
+        return self._sprites.stats()
+
+    def _load(self, key: tuple, factory, persist: bool) -> Image.Image:
+        if not persist or not self.cache_dir:
+            return self._draw(factory)
+
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        code_files = (factory.__code__.co_filename,) + tuple(os.path.join(base_dir, path) for path in CODE_FILES)
+        sprite_id = hashlib.sha1(f'{key!r}:{code_version(*code_files)}'.encode()).hexdigest()
+        sprite_path = os.path.join(self.cache_dir, f'{sprite_id}.png')
+        if os.path.exists(sprite_path):
+            with Image.open(sprite_path) as img:
+                img.load()
+                return img
+
+        img = self._draw(factory)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with atomic_write(sprite_path) as f:
+            img.save(f, format='PNG', compress_level=1)
+        return img
+
+    def _draw(self, factory) -> Image.Image:
+        with span('sprites.draw'):
+            return factory()
+
+
+sprites = SpriteCache()
@@ -0,0 +1,91 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+_logger = logging.getLogger(__name__)
+
+# spans whose breakdown is logged at INFO, other outermost spans at DEBUG
+ROOT_SPANS = ('render', 'read')
+
+
+class Tracer:
+    """
+    Nested timing spans. When the outermost span of a thread ends (e.g. a
+    whole render), the time spent in each span nested in it is logged, summed
+    by name (nested spans are also counted in their parents). Only the
+    breakdowns of ROOT_SPANS are logged at INFO, spans run outside of them
+    (e.g. an asset decoded while warming the caches) are logged at DEBUG.
+
+    Set `recording` to keep every span and `save` them as a Chrome trace
+    (chrome://tracing, https://ui.perfetto.dev).
+    """
+    def __init__(self):
+        self.recording = False
+        self.events = []
+        self._local = threading.local()
+
+    @contextmanager
+    def span(self, name: str, **args):
+        stack = self._stack()
+        start = time.perf_counter()
+        stack.append({})
+        try:
+            yield
+        finally:
+            breakdown = stack.pop()
+            duration = time.perf_counter() - start
+            if stack:
+                total, count = stack[0].get(name, (0, 0))
+                stack[0][name] = (total + duration, count + 1)
+            else:
+                self._log(name, args, duration, breakdown)
+            if self.recording:
+                self.events.append({
+                    'name': name,
+                    'ph': 'X',
+                    'ts': start * 1e6,
+                    'dur': duration * 1e6,
+                    'pid': os.getpid(),
+                    'tid': threading.get_ident(),
+                    'args': args,
+                })
+
+    def timed(self, name: str):
+        """
+        Decorator running the whole function in a span
+        """
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def save(self, path: str):
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, f)
+        _logger.info(f'{len(self.events)} spans saved in "{os.path.realpath(path)}"')
+
+    def _stack(self) -> list:
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def _log(self, name: str, args: dict, duration: float, breakdown: dict):
+        label = ' '.join([name] + [str(value) for value in args.values()])
+        details = ', '.join(
+            f'{span_name} {total * 1000:.1f}ms' + (f' x{count}' if count > 1 else '')
+            for span_name, (total, count) in breakdown.items()
+        )
+        level = logging.INFO if name in ROOT_SPANS else logging.DEBUG
+        _logger.log(level, f'{label} took {duration * 1000:.1f}ms' + (f' ({details})' if details else ''))
+
+
+tracer = Tracer()
+span = tracer.span
+timed = tracer.timed
@@ -1,9 +1,11 @@
 from dataclasses import dataclass
+from io import BytesIO
 from PIL.PngImagePlugin import PngImageFile
 from PIL import Image, ImageDraw, ImageFont
 from enum import Enum
 
 from font_factory import FontFactory
+from helpers.cache import LRUCache
 
 @dataclass
 class Dimension():
@@ -19,9 +21,52 @@ class GradientDirection(Enum):
     RIGHT_TO_LEFT = 1
 
 
+_gradient_masks = LRUCache(256)
+
 def gradient(img: PngImageFile, direction: GradientDirection = GradientDirection.RIGHT_TO_LEFT):
-    alpha = Image.linear_gradient('L').rotate(direction.value*90).resize((img.width, img.height))
-    img.putalpha(alpha)
+    img.putalpha(gradient_mask(img.width, img.height, direction))
+
+def gradient_mask(width: int, height: int, direction: GradientDirection = GradientDirection.RIGHT_TO_LEFT, span: tuple = (0, 1)):
+    """
+    'L' mask of `width`x`height` fading along `direction`, memoized by
+    (width, height, direction, span). `span` keeps only a part of the fade,
+    stretched over the whole mask, e.g. (0.5, 1) for its second half.
+    The returned mask is shared and must not be modified.
+    """
+    key = (width, height, direction, span)
+    return _gradient_masks.get_or_create(key, lambda: _build_gradient_mask(width, height, direction, span))
+
+def _build_gradient_mask(width: int, height: int, direction: GradientDirection, span: tuple):
+    import numpy
+    # The gradient only varies along one axis: resample a 1px wide profile
+    # of it (same filter as resizing the whole 256x256 gradient) and repeat
+    # it over the other axis
+    horizontal = direction in (GradientDirection.LEFT_TO_RIGHT, GradientDirection.RIGHT_TO_LEFT)
+    ramp = Image.linear_gradient('L').rotate(direction.value*90)
+    length = width if horizontal else height
+    profile = ramp.crop((0, 0, ramp.width, 1) if horizontal else (0, 0, 1, ramp.height))
+    size = (length, 1) if horizontal else (1, length)
+    profile = profile.resize(size)
+    if span != (0, 1):
+        start, end = span[0] * length, span[1] * length
+        box = (start, 0, end, 1) if horizontal else (0, start, 1, end)
+        profile = profile.crop(box).resize(size)
+
+    values = numpy.asarray(profile).reshape(-1)
+    if horizontal:
+        mask = numpy.broadcast_to(values, (height, width))
+    else:
+        mask = numpy.broadcast_to(values[:, None], (height, width))
+    return Image.fromarray(numpy.ascontiguousarray(mask), 'L')
+
+def to_buffer(img: PngImageFile, image_format: str = 'PNG', **params) -> BytesIO:
+    """
+    Encode `img` in memory, `getvalue()`/`getbuffer()` give the raw bytes
+    """
+    buffer = BytesIO()
+    img.save(buffer, format=image_format, **params)
+    buffer.seek(0)
+    return buffer
 
 def get_round_corner_mask(img: PngImageFile, radius=50):
     mask = Image.new('1', (img.width, img.height), 0)
@@ -40,11 +85,27 @@ def resize(img: PngImageFile, width, height, keep_ratio=True):
     else:
         return img.resize((width, height))
 
+# textbbox only needs a draw context, not a canvas of the text's size
+_measure_draw = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+_text_bboxes = LRUCache(4096)
+
+def _font_key(font:ImageFont.FreeTypeFont):
+    return (font.path, font.size, font.index, font.encoding, font.layout_engine)
+
+def text_bbox(text:str, font:ImageFont.FreeTypeFont, **kwargs):
+    """
+    Bounding box of `text` drawn at (0, 0), memoized by (text, font, kwargs).
+    """
+    try:
+        key = (text, _font_key(font), tuple(sorted(kwargs.items())))
+        hash(key)
+    except TypeError:
+        return _measure_draw.textbbox((0,0), text, font, **kwargs)
+    return _text_bboxes.get_or_create(key, lambda: _measure_draw.textbbox((0,0), text, font, **kwargs))
+
 def text_size(text:str, font:ImageFont.FreeTypeFont, img:PngImageFile=None, **kwargs):
-    if not img:
-        img = Image.new('RGB', (5000, 5000))
-    draw = ImageDraw.Draw(img)
-    _,_, width, height = draw.textbbox((0,0), text, font, **kwargs)
+    # `img` is kept for backward compatibility, measuring does not need it
+    _,_, width, height = text_bbox(text, font, **kwargs)
     return width, height
 
 def text_on_gradient(txt: str, text_color, font:ImageFont.FreeTypeFont, padding=20, stroke_width=0, stroke_fill=None, **kwargs):
@@ -76,26 +137,84 @@ def paste(img:PngImageFile, on_what:PngImageFile, left=False, top=False, with_al
         return (left, top, left+img.width, top+img.height)
     return Dimension(left, top, left+img.width, top+img.height)
 
+_fitted_font_sizes = LRUCache(1024)
+
 def get_max_font_size(text, width, height, Font=FontFactory.regular, initial_font_size=20):
-    img = Image.new('RGB', (width, height))
-    return determine_font_size(text, img, Font, initial_font_size)
+    """
+    Font size at which `text` fits in a `width`x`height` box, memoized by
+    (text, Font, box, initial_font_size).
+
+    When `initial_font_size` already fits (with a 10px margin), this is the
+    largest size that still fits with that margin, otherwise the largest
+    smaller size that fits strictly inside the box.
+    """
+    key = (text, Font, width, height, initial_font_size)
+    return _fitted_font_sizes.get_or_create(key, lambda: _fit_font_size(text, width, height, Font, initial_font_size))
 
 def determine_font_size(text, img, Font=FontFactory.regular, initial_font_size=20):
-    font_size = initial_font_size
-    txt_width, txt_height = text_size(text, Font(font_size), img)
+    return get_max_font_size(text, img.width, img.height, Font, initial_font_size)
+
+def _fit_font_size(text, width, height, Font, initial_font_size):
     height_offset = 10
-    is_ascending = False
-    while txt_width <= img.width-height_offset and txt_height <= img.height-height_offset:
-        is_ascending = True
-        font_size += 1
-        txt_width, txt_height = text_size(text, Font(font_size), img)
-    if is_ascending:
-        return font_size - 1
-
-    while txt_width >= img.width or txt_height >= img.height:
-        font_size -= 1
-        txt_width, txt_height = text_size(text, Font(font_size), img)
-    return font_size
+    txt_width, txt_height = text_size(text, Font(initial_font_size))
+    if txt_width <= width-height_offset and txt_height <= height-height_offset:
+        def fits(size):
+            w, h = text_size(text, Font(size))
+            return w <= width-height_offset and h <= height-height_offset
+        max_width, max_height = width-height_offset, height-height_offset
+        growing = True
+    elif txt_width < width and txt_height < height:
+        return initial_font_size
+    else:
+        def fits(size):
+            w, h = text_size(text, Font(size))
+            return w < width and h < height
+        max_width, max_height = width-1, height-1
+        growing = False
+
+    # glyphs scale roughly linearly with the font size: one measurement
+    # gives a first guess that brackets the answer within a few steps
+    scale = min(max_width / max(txt_width, 1), max_height / max(txt_height, 1))
+    guess = max(1, int(initial_font_size * scale))
+
+    if growing:
+        # fits(low) is True, fits(high) is False
+        low, high = initial_font_size, None
+        if guess > low:
+            if fits(guess):
+                low = guess
+            else:
+                high = guess
+        step = 1
+        while high is None:
+            if fits(low + step):
+                low += step
+                step *= 2
+            else:
+                high = low + step
+    else:
+        low, high = None, initial_font_size
+        if guess < high:
+            if fits(guess):
+                low = guess
+            else:
+                high = guess
+        step = 1
+        while low is None:
+            candidate = max(1, high - step)
+            if candidate == 1 or fits(candidate):
+                low = candidate
+            else:
+                high = candidate
+                step *= 2
+
+    while high - low > 1:
+        middle = (low + high) // 2
+        if fits(middle):
+            low = middle
+        else:
+            high = middle
+    return low
 
 def draw_lines(img: PngImageFile, color:tuple, space_between_lines=7, line_width=2):
     draw = ImageDraw.Draw(img)
@@ -124,6 +243,21 @@ def draw_lines_all(img: PngImageFile, color:tuple, space_between_lines=7, line_w
         i += space_between_lines
         j += space_between_lines
 
+_hatched_images = LRUCache(maxsize=None, max_weight=128 * 1024 * 1024, weigher=lambda img: img.width * img.height * 3)
+
+def hatched_image(size:tuple, bg_color:tuple, color:tuple, space_between_lines=7, line_width=2, pattern=draw_lines_all):
+    """
+    RGB image of `size` filled with `bg_color` and hatched with `pattern`
+    (draw_lines_all or draw_lines). The hatching is drawn once per set of
+    arguments, later calls get a copy of the memoized background.
+    """
+    key = (size, bg_color, color, space_between_lines, line_width, pattern)
+    def build():
+        img = Image.new('RGB', size, bg_color)
+        pattern(img, color, space_between_lines, line_width)
+        return img
+    return _hatched_images.get_or_create(key, build).copy()
+
 def repeat_text(base: PngImageFile, color:tuple, txt: str, Font=FontFactory.regular, font_size=120, angle=15):
     img = Image.new('RGBA', (int(1.5*base.width), int(1.5*base.height)), (0,0,0,0))
     font = Font(font_size)
@@ -0,0 +1,52 @@
+import logging
+import os.path
+from helpers.sheet_cache import trim_rows
+from helpers.timing import span
+
+_logger = logging.getLogger(__name__)
+
+
+class XlsxWorkbook:
+    """
+    Read-only, streaming access to cell ranges of an xlsx file, opened once
+    for all the ranges read. A sheet is only parsed up to the last row of the
+    range asked, and empty cells are None (the equivalent of the rows returned
+    by `values().batchGet` of the Sheets API, with typed values).
+
+        with XlsxWorkbook('data.xlsx') as workbook:
+            rows = workbook.get_ranges({'values': "_values!A1:G30"})['values']
+    """
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self._workbook = None
+
+    def __enter__(self):
+        from openpyxl import load_workbook
+        with span('xlsx.open'):
+            self._workbook = load_workbook(self.filepath, read_only=True, data_only=True, keep_links=False)
+        return self
+
+    def __exit__(self, *exc):
+        self._workbook.close()
+        self._workbook = None
+
+    @property
+    def sheet_names(self) -> list:
+        return self._workbook.sheetnames
+
+    def get_range(self, range_str: str) -> list:
+        from openpyxl.utils.cell import range_to_tuple
+        sheet_name, (min_col, min_row, max_col, max_row) = range_to_tuple(range_str)
+        if sheet_name not in self._workbook.sheetnames:
+            raise Exception(f'Unable to read range "{range_str}", there is no sheet "{sheet_name}" in "{os.path.realpath(self.filepath)}"')
+        rows = self._workbook[sheet_name].iter_rows(
+            min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col, values_only=True
+        )
+        return trim_rows(rows)
+
+    def get_ranges(self, ranges: dict) -> dict:
+        """
+        Rows of every range of `ranges` ({key: A1 range}) as {key: rows}
+        """
+        with span('xlsx.get_ranges', count=len(ranges)):
+            return {key: self.get_range(range_str) for key, range_str in ranges.items()}
@@ -0,0 +1,46 @@
+import argparse
+import subprocess
+import sys
+
+DEFAULT_MODULES = ('breaking', 'helpers.renderer', 'generators.results_generator', 'helpers.reader')
+
+
+class ImportReportCommand(argparse.ArgumentParser):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.add_argument("modules", help=f"Modules to import (default: {' '.join(DEFAULT_MODULES)})", nargs='*', default=list(DEFAULT_MODULES))
+        self.add_argument("-n", "--top", help="Number of most expensive modules to list for each import", dest='top', type=int, default=10)
+
+
+def import_times(module: str) -> list:
+    """
+    [(module, self µs, cumulative µs)] of every module imported by a cold
+    `import module`, as reported by `python -X importtime`
+    """
+    res = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], capture_output=True, text=True)
+    if res.returncode:
+        raise Exception(f'Unable to import {module}:\n{res.stderr.splitlines()[-1]}')
+    times = []
+    for line in res.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times.append((name.strip(), int(self_us), int(cumulative_us)))
+    return times
+
+####### MAIN
+
+if __name__ == "__main__":
+    args = ImportReportCommand().parse_args()
+    for module in args.modules:
+        try:
+            times = import_times(module)
+        except Exception as e:
+            print(e)
+            continue
+        total = sum(self_us for _, self_us, _ in times)
+        print(f'{module}: {total / 1000:.0f}ms, {len(times)} modules')
+        for name, self_us, cumulative_us in sorted(times, key=lambda t: -t[1])[:args.top]:
+            print(f'  {self_us / 1000:7.1f}ms self {cumulative_us / 1000:7.1f}ms cumulative  {name}')
+        heavy = [name for name in ('pandas', 'numpy', 'googleapiclient') if any(t[0] == name for t in times)]
+        print(f'  heavy dependencies: {", ".join(heavy) or "none"}')
@@ -1,8 +1,9 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import os
 from PIL import Image, ImageDraw
 from font_factory import FontFactory
-from helpers.transform import GradientDirection, gradient, resize, text_size, paste
+from helpers.assets import assets
+from helpers.transform import GradientDirection, gradient, gradient_mask, text_size, paste
 
 @dataclass
 class Team:
@@ -72,11 +73,10 @@ class Team:
         )
 
         # logo
-        with Image.open(self.get_image()) as team_image:
-            padding = 4
-            image_size = box_height - padding
-            team_image = resize(team_image, image_size, image_size)
-            paste(team_image, img, left=width -  team_image.width- 10)
+        padding = 4
+        image_size = box_height - padding
+        team_image = assets.resized(self.get_image(), image_size, image_size)
+        paste(team_image, img, left=width -  team_image.width- 10)
 
         return img
 
@@ -96,8 +96,7 @@ class Team:
         box_height = font_size+line_separation
         # Build an alpha/transparency channel
         bg = Image.new('RGB', (width, box_height))
-        alpha = Image.linear_gradient('L').rotate(90).resize((width,box_height))
-        bg.putalpha(alpha)
+        bg.putalpha(gradient_mask(width, box_height, GradientDirection.RIGHT_TO_LEFT))
 
         img.paste(bg)
         draw = ImageDraw.Draw(img)
@@ -126,13 +125,12 @@ class Team:
         )
 
         # logo
-        with Image.open(self.get_image()) as team_image:
-            padding = 4
-            image_size = box_height - padding
-            left = width // 3 - team_image.width - 10
-            top = 0
-            team_image.thumbnail((image_size, image_size), Image.Resampling.LANCZOS)
-            img.paste(team_image, (left, top), team_image)
+        padding = 4
+        image_size = box_height - padding
+        left = width // 3 - assets.get(self.get_image()).width - 10
+        top = 0
+        team_image = assets.resized(self.get_image(), image_size, image_size)
+        img.paste(team_image, (left, top), team_image)
 
         left = width // 3 + 20
         draw = ImageDraw.Draw(img)
@@ -210,11 +208,10 @@ class Pilot:
         )
 
         # TEAM
-        with Image.open(self.get_team_image()) as team_image:
-            padding = 4
-            image_size = height - padding
-            team_image.thumbnail((image_size, image_size), Image.Resampling.LANCZOS)
-            img.paste(team_image, ((width - team_image.width) - padding, padding//2), team_image)
+        padding = 4
+        image_size = height - padding
+        team_image = assets.resized(self.get_team_image(), image_size, image_size)
+        img.paste(team_image, ((width - team_image.width) - padding, padding//2), team_image)
 
         return img
 
@@ -226,22 +223,18 @@ class Pilot:
         else:
             bg_color = (0,0,0)
         grid_position_bg = Image.new('RGB', (width, height), bg_color)
-        alpha = Image.linear_gradient('L').rotate(-90).resize((width,height))
-        grid_position_bg.putalpha(alpha)
+        grid_position_bg.putalpha(gradient_mask(width, height, GradientDirection.LEFT_TO_RIGHT))
         img.paste(grid_position_bg, (5,0))
 
         white_box_width = height
-        with Image.open(f'assets/results/positions/{position}.png') as tmp:
-            grid_position_number = tmp.copy().convert('RGBA')
-            grid_position_number.thumbnail((white_box_width, height), Image.Resampling.LANCZOS)
-            img.paste(grid_position_number, grid_position_number)
+        grid_position_number = assets.resized(f'assets/results/positions/{position}.png', white_box_width, height, mode='RGBA')
+        img.paste(grid_position_number, grid_position_number)
 
         pilot_image = self.get_image(width - (white_box_width+15), height, number_font, pilot_font)
         img.paste(pilot_image, (white_box_width+15, 0), pilot_image)
         if has_fastest_lap and with_fastest_img:
-            with Image.open(f'assets/fastest_lap.png') as fstst_img:
-                fstst_img.thumbnail((height, height), Image.Resampling.LANCZOS)
-                img.paste(fstst_img, (width-fstst_img.width * 2, 0))
+            fstst_img = assets.resized('assets/fastest_lap.png', height, height)
+            img.paste(fstst_img, (width-fstst_img.width * 2, 0))
 
         return img
 
@@ -253,28 +246,69 @@ class Circuit:
     best_lap: str
     city: str = None
 
+    def get_flag_path(self):
+        return f'assets/circuits/flags/{self.id}.png'
+
     def get_flag(self):
-        return Image.open(f'assets/circuits/flags/{self.id}.png')
+        return assets.open(self.get_flag_path())
 
-    def get_title_image(self, height:int, font):
-        tmp = Image.new('RGBA', (5000, height), (255, 0, 0, 0))
-        tmp_draw = ImageDraw.Draw(tmp)
+    def get_title_image(self, height:int, font, flag:Image.Image = None):
         # circuit name
-        _,_,text_width,text_height = tmp_draw.textbbox((0,0), self.name, font)
+        text_width, text_height = text_size(self.name, font)
         text_top = (height - text_height) // 2
         # flag
-        with Image.open(f'assets/circuits/flags/{self.id}.png') as flag:
-            flag.thumbnail((height,height), Image.Resampling.LANCZOS)
-
-            padding_between = 30
-            width = text_width + flag.width + padding_between
-            img = Image.new('RGBA', (width, height), (255, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
-            flag_left = text_width + padding_between
-            draw.text((0, text_top), self.name, (255, 255, 255), font)
-            img.paste(flag, (flag_left, text_top), flag)
+        if flag is None:
+            flag = assets.resized(self.get_flag_path(), height, height)
+
+        padding_between = 30
+        width = text_width + flag.width + padding_between
+        img = Image.new('RGBA', (width, height), (255, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+        flag_left = text_width + padding_between
+        draw.text((0, text_top), self.name, (255, 255, 255), font)
+        img.paste(flag, (flag_left, text_top), flag)
         return img
 
+class RaceContext:
+    """
+    Images of a race's circuit (flag, map and photo variants) and the
+    decorations drawn around them, loaded the first time a visual of the race
+    needs them and then shared by every generator rendering that race (e.g.
+    the visuals of a batch, which share the same Race). Images are shared and
+    must be treated as read-only.
+    """
+    def __init__(self, circuit: Circuit):
+        self.circuit = circuit
+        self._images = {}
+
+    def flag(self, width: int, height: int) -> Image.Image:
+        return self._get(('flag', width, height), lambda: assets.resized(self.circuit.get_flag_path(), width, height))
+
+    def map(self, width: int, height: int) -> Image.Image:
+        return self._get(('map', width, height), lambda: assets.resized(f'assets/circuits/maps/{self.circuit.id}.png', width, height))
+
+    def photo(self, width: int, height: int) -> Image.Image:
+        return self._get(('photo', width, height), lambda: assets.resized(f'assets/circuits/photos/{self.circuit.id}.png', width, height))
+
+    def faded_photo(self, width: int, height: int) -> Image.Image:
+        """
+        Photo fading out from its middle to its bottom
+        """
+        def build():
+            photo = self.photo(width, height).copy()
+            photo.putalpha(gradient_mask(photo.width, photo.height, GradientDirection.UP_TO_DOWN, span=(0, 0.5)))
+            return photo
+        return self._get(('faded_photo', width, height), build)
+
+    @property
+    def red_corner(self) -> Image.Image:
+        return self._get(('red_corner',), lambda: assets.get('assets/results/redcorner.png').convert('RGBA'))
+
+    def _get(self, key: tuple, factory) -> Image.Image:
+        if key not in self._images:
+            self._images[key] = factory()
+        return self._images[key]
+
 @dataclass
 class Race:
     round: int
@@ -287,6 +321,22 @@ class Race:
     teams: list
     type: str
     swappings: dict = None
+    _context: RaceContext = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def context(self) -> RaceContext:
+        """
+        Lazily loaded images of the race's circuit, see RaceContext
+        """
+        if self._context is None or self._context.circuit is not self.circuit:
+            self._context = RaceContext(self.circuit)
+        return self._context
+
+    def __getstate__(self):
+        # decoded images are not sent to other processes, which load their own
+        state = self.__dict__.copy()
+        state['_context'] = None
+        return state
 
     def get_total_length(self):
         return '{:.3f}'.format(self.laps * self.circuit.lap_length)
@@ -304,8 +354,7 @@ class Race:
     def get_title_image(self, width: int, height: int, font, big_font):
         img = Image.new('RGBA', (width, height), (255, 0, 0, 0))
         # bg
-        with Image.open(f'assets/results/bgdate.png') as bg_date:
-            bg_date.thumbnail((int(3 * width / 4), height), Image.Resampling.LANCZOS)
+        bg_date = assets.resized('assets/results/bgdate.png', int(3 * width / 4), height)
         img.paste(bg_date)
         draw_canvas = ImageDraw.Draw(img)
         left = 20
@@ -317,9 +366,8 @@ class Race:
         # circuit name
         draw_canvas.text((left+250,top+5), self.circuit.name, 'white', big_font)
         # flag
-        with Image.open(f'assets/circuits/flags/{self.circuit.id}.png') as flag:
-            flag.thumbnail((100,100), Image.Resampling.LANCZOS)
-            img.paste(flag, (bg_date.width - flag.width - 10, top-2), flag)
+        flag = self.context.flag(100, 100)
+        img.paste(flag, (bg_date.width - flag.width - 10, top-2), flag)
         return img
 
     def get_title_image_simple(self, width:int, height:int, date_font, circuit_font):
@@ -337,7 +385,7 @@ class Race:
         # month
         draw.text((month_left,month_top), self.month, 'grey', date_font)
 
-        circuit_img = self.circuit.get_title_image(height, circuit_font)
+        circuit_img = self.circuit.get_title_image(height, circuit_font, self.context.flag(height, height))
         circuit_top = (height-circuit_img.height) // 2
         circuit_left = month_left + month_width + 20
         img.paste(circuit_img, (circuit_left, circuit_top), circuit_img)
@@ -347,15 +395,12 @@ class Race:
         img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
         bg_top = 0
         bg = Image.new('RGB', (width, height), (80, 80, 80))
-        alpha = Image.linear_gradient('L').rotate(90).resize((width, height))
-        # alpha = alpha.crop((alpha.width/2, 0, alpha.width, alpha.height)).resize((width, height))
-        bg.putalpha(alpha)
+        bg.putalpha(gradient_mask(width, height, GradientDirection.RIGHT_TO_LEFT))
         img.paste(bg, (0, bg_top), bg)
 
         draw_canvas = ImageDraw.Draw(img)
-        with Image.open('assets/results/redcorner.png') as red_corner:
-            red_corner = red_corner.convert('RGBA')
-            img.paste(red_corner, (0, bg_top), red_corner)
+        red_corner = self.context.red_corner
+        img.paste(red_corner, (0, bg_top), red_corner)
         draw_canvas.rectangle(((0,bg_top+red_corner.height), (9, bg_top+red_corner.height+325)), fill=(255, 0, 0))
         draw_canvas.rectangle(((red_corner.width-2,bg_top), (width, bg_top+9)), fill=(255, 0, 0))
 
@@ -372,33 +417,25 @@ class Race:
         draw_canvas.text((50,bg_top+350), f'{self.circuit.best_lap}', info_color, font)
 
         # map
-        with Image.open(f'assets/circuits/maps/{self.circuit.id}.png') as map:
-            map.thumbnail((width, height//2), Image.Resampling.LANCZOS)
-            img.paste(map, (width - map.width, height - map.height), map)
+        map = self.context.map(width, height//2)
+        img.paste(map, (width - map.width, height - map.height), map)
         return img
 
     def get_information_image(self, width: int, height: int, font):
         img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
 
         # photo
-        with Image.open(f'assets/circuits/photos/{self.circuit.id}.png') as photo:
-            photo.thumbnail((width, height), Image.Resampling.LANCZOS)
-            alpha = Image.linear_gradient('L').rotate(180).resize((photo.width, photo.height))
-            alpha = alpha.crop((0, 0, alpha.width, alpha.height/2)).resize((photo.width, photo.height))
-            photo.putalpha(alpha)
-            img.paste(photo)
+        photo = self.context.faded_photo(width, height)
+        img.paste(photo)
 
         bg_top = int(3 * (photo.height / 4))
         bg = Image.new('RGB', (width, height), (120, 120, 120))
-        alpha = Image.linear_gradient('L').rotate(90).resize((width, height))
-        alpha = alpha.crop((alpha.width/2, 0, alpha.width, alpha.height)).resize((width, height))
-        bg.putalpha(alpha)
+        bg.putalpha(gradient_mask(width, height, GradientDirection.RIGHT_TO_LEFT, span=(0.5, 1)))
         img.paste(bg, (0, bg_top), bg)
 
         draw_canvas = ImageDraw.Draw(img)
-        with Image.open('assets/results/redcorner.png') as red_corner:
-            red_corner = red_corner.convert('RGBA')
-            img.paste(red_corner, (0, bg_top), red_corner)
+        red_corner = self.context.red_corner
+        img.paste(red_corner, (0, bg_top), red_corner)
         draw_canvas.rectangle(((0,bg_top+red_corner.height), (9, bg_top+red_corner.height+300)), fill=(255, 0, 0))
         draw_canvas.rectangle(((red_corner.width-2,bg_top), (width, bg_top+9)), fill=(255, 0, 0))
 
@@ -415,9 +452,8 @@ class Race:
         draw_canvas.text((50,bg_top+325), f'{self.circuit.best_lap}', info_color, font)
 
         # map
-        with Image.open(f'assets/circuits/maps/{self.circuit.id}.png') as map:
-            map.thumbnail((625, 5000), Image.Resampling.LANCZOS)
-            img.paste(map, (width - map.width, height - map.height), map)
+        map = self.context.map(625, 5000)
+        img.paste(map, (width - map.width, height - map.height), map)
         return img
 
     def get_pilots(self, team):
@@ -452,19 +488,17 @@ class Visual:
 
     @staticmethod
     def get_fbrt_logo(no_border=False):
-        return Image.open(f'assets/fbrt{"_no_border" if no_border else ""}.png')
+        return assets.open(f'assets/fbrt{"_no_border" if no_border else ""}.png')
 
     @staticmethod
     def get_f1_logo(black=False):
-        return Image.open(f'assets/f122{"_black" if black else ""}.png')
+        return assets.open(f'assets/f122{"_black" if black else ""}.png')
 
     def get_title_image(self, width:int, height: int):
         img = Image.new('RGBA', (width, height), (255, 0, 0, 0))
         # background
-        with Image.open(f'assets/results/bgtop.png') as tmp:
-            bg_top = tmp.copy().convert('RGBA')
-            bg_top.thumbnail((width, height), Image.Resampling.LANCZOS)
-            img.paste(bg_top, (0, 0), bg_top)
+        bg_top = assets.resized('assets/results/bgtop.png', width, height, mode='RGBA')
+        img.paste(bg_top, (0, 0), bg_top)
 
         # FBRT logo
         with Visual.get_fbrt_logo() as fbrt:
@@ -569,7 +603,7 @@ class PilotResult:
         pilot_image = self.pilot.get_ranking_image(self.position, width, height, small_font, pilot_font, has_fastest_lap, with_fastest_img)
         draw = ImageDraw.Draw(pilot_image)
         split = self.split if (self.position == 1 or self.split in ('NT', 'DSQ')) else f'+{self.split}'
-        _,_,real_split_width, split_height = draw.textbbox((0,0), split, small_font)
+        real_split_width, split_height = text_size(split, small_font)
         diff = largest_split_width - real_split_width
         pilot_right = 460
 
@@ -579,10 +613,9 @@ class PilotResult:
         current_left = split_left+real_split_width + 20
         padding = -12 if len(self.tyres) <= 5 else -28
         for tyre in self.tyres:
-            with Image.open(f'./assets/tyres/{tyre}.png') as tyre_img:
-                tyre_img.thumbnail((height, height))
-                pilot_image.paste(tyre_img, (current_left, 0), tyre_img)
-                # tyre_img has a transparent contour
-                current_left += (tyre_img.width + padding)
+            tyre_img = assets.resized(f'./assets/tyres/{tyre}.png', height, height, resample=Image.Resampling.BICUBIC)
+            pilot_image.paste(tyre_img, (current_left, 0), tyre_img)
+            # tyre_img has a transparent contour
+            current_left += (tyre_img.width + padding)
 
         return pilot_image
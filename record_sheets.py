@@ -0,0 +1,27 @@
+import argparse
+import logging
+from helpers.fake_sheets import DEFAULT_FIXTURES_DIR, record_fixture
+from helpers.reader import Reader
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    handlers=[logging.StreamHandler()]
+)
+_logger = logging.getLogger(__name__)
+
+
+class RecordSheetsCommand(argparse.ArgumentParser):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.add_argument("-i", "--input", help="Google sheet to record (use 'gsheet:TIMESHEET_ID' for another sheet than the default one)", dest='input', default='gsheet')
+        self.add_argument("-o", "--output-dir", help="Directory where the fixture is saved (as TIMESHEET_ID.json)", dest='output_dir', default=DEFAULT_FIXTURES_DIR)
+
+####### MAIN
+
+if __name__ == "__main__":
+    args = RecordSheetsCommand().parse_args()
+    reader = Reader('numbers', args.input)
+    path = record_fixture(reader._get_google_spreadsheet(), reader.spreadsheet_id, args.output_dir)
+    _logger.info(f'Sheets of "{reader.spreadsheet_id}" recorded in "{path}"')
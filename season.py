@@ -0,0 +1,112 @@
+import argparse
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from helpers.cache import atomic_write
+from helpers.reader import RACE_TYPES
+from helpers.render_cache import renders
+from helpers.renderer import Renderer
+from helpers.season_reader import SeasonReader
+from helpers.command import add_sheets_arguments, setup_sheets
+
+STATE_FILENAME = 'season_state.json'
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    handlers=[logging.StreamHandler()]
+)
+_logger = logging.getLogger(__name__)
+
+
+class SeasonCommand(argparse.ArgumentParser):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.add_argument("-t", "--types", help=f"Types of visuals to render for each race (default: {' '.join(RACE_TYPES)})", dest='types', nargs='+', choices=RACE_TYPES, default=list(RACE_TYPES))
+        self.add_argument("-o", "--output-dir", help="Directory where visuals are rendered (as RACE_N/TYPE.png)", dest='output_dir', default='./output/season')
+        self.add_argument("-i", "--input", help="Input file to use (use 'gsheet:TIMESHEET_ID' for google sheet (replace TIMESHEET_ID with the id of the sheet of course)", dest='input', default='gsheet')
+        self.add_argument("-j", "--jobs", help="Number of processes rendering visuals (default: number of cores)", dest='jobs', type=int, default=os.cpu_count())
+        self.add_argument("-f", "--force", help="Render every visual again, even the ones already rendered by a previous run", dest='force', action='store_true')
+        add_sheets_arguments(self)
+
+
+def _render(config, use_cache: bool) -> float:
+    start = time.perf_counter()
+    Renderer.render(config, use_cache=use_cache)
+    return time.perf_counter() - start
+
+
+class SeasonRenderer:
+    """
+    Renders a whole season's configs in a pool of processes.
+
+    Each visual already rendered is recorded in `STATE_FILENAME` (within the
+    output directory) with the hash of its content (config, code and assets,
+    see RenderCache), so an interrupted run resumes where it stopped and
+    visuals whose inputs did not change are not rendered again.
+    """
+    def __init__(self, output_dir: str, jobs: int = None, use_cache: bool = True):
+        self.output_dir = output_dir
+        self.jobs = jobs or os.cpu_count()
+        self.use_cache = use_cache
+        self.state_path = os.path.join(output_dir, STATE_FILENAME)
+        self.state = self._load_state()
+
+    def render(self, configs: dict, force: bool = False) -> list:
+        """
+        Render `configs` ({(sheet_name, type): config}), returns the jobs that failed
+        """
+        todo = {}
+        for (sheet_name, type), config in configs.items():
+            job_id = f'{sheet_name}/{type}'
+            key = renders.key(config, Renderer.get_generator(type), 'PNG')
+            if not force and self.state.get(job_id) == key and os.path.exists(config.output):
+                continue
+            os.makedirs(os.path.dirname(config.output), exist_ok=True)
+            todo[job_id] = (config, key)
+        _logger.info(f'{len(todo)} visuals to render ({len(configs) - len(todo)} already up to date) with {self.jobs} processes')
+
+        failed = []
+        with ProcessPoolExecutor(self.jobs) as executor:
+            futures = {
+                executor.submit(_render, config, self.use_cache): job_id
+                for job_id, (config, key) in todo.items()
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                job_id = futures[future]
+                try:
+                    duration = future.result()
+                except Exception as e:
+                    failed.append(job_id)
+                    _logger.error(f'[{done}/{len(todo)}] {job_id} failed: {e!r}')
+                    continue
+                self.state[job_id] = todo[job_id][1]
+                self._save_state()
+                _logger.info(f'[{done}/{len(todo)}] {job_id} rendered in {duration:.2f}s')
+        return failed
+
+    def _load_state(self) -> dict:
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path) as f:
+            return json.load(f)
+
+    def _save_state(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        with atomic_write(self.state_path, 'w') as f:
+            json.dump(self.state, f, indent=1, sort_keys=True)
+
+####### MAIN
+
+if __name__ == "__main__":
+    args = SeasonCommand().parse_args()
+    setup_sheets(args)
+
+    configs = SeasonReader(args.input, args.output_dir, args.types).read()
+    failed = SeasonRenderer(args.output_dir, args.jobs, not args.no_cache).render(configs, args.force)
+    if failed:
+        _logger.error(f'{len(failed)} visuals failed: {", ".join(failed)}')
+        exit(1)
+    _logger.info(f'Season rendered in "{os.path.realpath(args.output_dir)}"')
@@ -0,0 +1,72 @@
+import argparse
+import logging
+import os
+import shutil
+from benchmark import build_configs
+from breaking import Renderer as BreakingRenderer
+from data import circuits, teams
+from helpers.assets import assets
+from helpers.renderer import Renderer
+from helpers.sprites import sprites
+from helpers.timing import span
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+    handlers=[logging.StreamHandler()]
+)
+_logger = logging.getLogger(__name__)
+
+
+class WarmCacheCommand(argparse.ArgumentParser):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.add_argument("-c", "--clear", help="Remove every cached variant and sprite before generating them again", dest='clear', action='store_true')
+
+
+def warm_assets(clear=False):
+    if clear and assets.cache_dir:
+        shutil.rmtree(assets.cache_dir, ignore_errors=True)
+
+    # every variant generators ask for, by drawing each visual from the
+    # synthetic configs of the benchmark (all the pilots and teams of data.py)
+    for type, config in build_configs().items():
+        with span('warm_assets', type=type):
+            Renderer.get_generator(type)(config).generate_image()
+    for team in teams:
+        with span('warm_assets', type='breaking', team=team.name):
+            BreakingRenderer('Breaking', 'News', team.name, '255,255,255', '0,0,0', output=None, input='assets/bg.png').render_image()
+
+    # variants of the circuit used by these configs, for every other circuit
+    circuit_variants = {}
+    for variant in assets.variants():
+        directory, filename = os.path.split(variant['path'])
+        if os.path.dirname(directory) == os.path.normpath('assets/circuits'):
+            spec = {key: value for key, value in variant.items() if key != 'path'}
+            circuit_variants[(directory, tuple(spec.items()))] = spec
+    for (directory, _), spec in circuit_variants.items():
+        for circuit in circuits.values():
+            path = os.path.join(directory, f'{circuit.id}.png')
+            if os.path.exists(path):
+                assets.resized(path, **spec)
+
+    _logger.info(f'{len(assets.variants())} asset variants cached in "{assets.cache_dir}"')
+
+def warm_sprites(clear=False):
+    if clear and sprites.cache_dir:
+        shutil.rmtree(sprites.cache_dir, ignore_errors=True)
+
+    # sprites of the pilots and teams of data.py (drawn again if one of them changed)
+    for type in Renderer.generators:
+        with span('build_sprites', type=type):
+            Renderer.get_generator(type).build_sprites()
+
+    _logger.info(f'{sprites.stats()["size"]} sprites built ({sprites.stats()["misses"]} drawn or loaded from "{sprites.cache_dir}")')
+
+####### MAIN
+
+if __name__ == "__main__":
+    args = WarmCacheCommand().parse_args()
+    warm_assets(args.clear)
+    warm_sprites(args.clear)